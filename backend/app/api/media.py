@@ -5,6 +5,7 @@ from math import ceil
 from typing import Annotated, Optional, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select, func, and_, or_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -34,19 +35,31 @@ from app.services.exporter import Exporter
 router = APIRouter()
 
 from app.core.analyzer import AudioAnalyzer
-from app.core.preference_engine import PreferenceEngine, AudioPreferences
+from app.core.preference_engine import (
+    ISSUE_FLAG_MISSING_DUAL_AUDIO,
+    ISSUE_FLAG_MISSING_ENGLISH,
+    ISSUE_FLAG_MISSING_JAPANESE,
+    AudioPreferences,
+    PreferenceEngine,
+    issue_flags,
+)
 from app.core.audio_fixer import (
     AudioTrackRemovalError,
     build_keep_audio_track_indices,
     remove_unwanted_audio_tracks,
-    set_default_track_by_language,
+    set_default_track_by_language_async,
 )
 from app.models.schemas import AudioPreferences as AudioPreferencesSchema
 
 
 def _build_issue_predicate(*patterns: str):
     """Build a SQL predicate that matches any known issue representation."""
-    return or_(*[MediaFile.issue_details.ilike(pattern) for pattern in patterns])
+    # issue_details is only set on flagged rows; the has_issues term lets
+    # the partial ix_media_files_user_issues index narrow the LIKE scan
+    return and_(
+        MediaFile.has_issues == True,
+        or_(*[MediaFile.issue_details.ilike(pattern) for pattern in patterns]),
+    )
 
 
 def _build_media_file_filters(
@@ -116,10 +129,21 @@ def _scan_location_user_scope_filters(current_user: User) -> list:
     return filters
 
 
+# Per-row responses below are built with model_construct: the values come
+# straight from typed DB columns, so field validation would only re-check them.
+# Every field is always passed, so the instances share one fields-set instead
+# of allocating a set each; the models are frozen, so it is never mutated.
+_AUDIO_TRACK_FIELDS = set(AudioTrackResponse.model_fields)
+_MEDIA_FILE_FIELDS = set(MediaFileResponse.model_fields)
+_SEASON_FIELDS = set(SeasonResponse.model_fields)
+_SHOW_FIELDS = set(ShowResponse.model_fields)
+
+
 def _build_audio_track_responses(audio_tracks: list) -> list[AudioTrackResponse]:
     """Build AudioTrackResponse list from ORM objects."""
     return [
-        AudioTrackResponse(
+        AudioTrackResponse.model_construct(
+            _AUDIO_TRACK_FIELDS,
             id=at.id,
             track_index=at.track_index,
             language=at.language,
@@ -138,7 +162,8 @@ def _build_audio_track_responses(audio_tracks: list) -> list[AudioTrackResponse]
 
 def _build_media_file_response(mf: MediaFile) -> MediaFileResponse:
     """Build MediaFileResponse from ORM object."""
-    return MediaFileResponse(
+    return MediaFileResponse.model_construct(
+        _MEDIA_FILE_FIELDS,
         id=mf.id,
         file_path=mf.file_path,
         filename=mf.filename,
@@ -252,6 +277,7 @@ async def _refresh_media_file_analysis(db: AsyncSession, mf: MediaFile, current_
     issues = preference_engine.evaluate(refreshed_tracks, is_anime=is_anime)
     mf.has_issues = len(issues) > 0
     mf.issue_details = "; ".join(issues) if issues else None
+    mf.issue_flags = issue_flags(issues)
 
     await db.flush()
     await db.refresh(mf, attribute_names=["audio_tracks", "show"])
@@ -269,77 +295,63 @@ async def get_dashboard_stats(
     media_scope_filters = _media_user_scope_filters(current_user)
     scan_scope_filters = _scan_location_user_scope_filters(current_user)
 
-    total_titles = await db.scalar(select(func.count(Show.id)).where(*show_scope_filters)) or 0
-
-    movie_count = await db.scalar(
-        select(func.count(Show.id)).where(*show_scope_filters, Show.media_type == "movie")
-    ) or 0
-    tv_count = await db.scalar(
-        select(func.count(Show.id)).where(*show_scope_filters, Show.media_type == "tv")
-    ) or 0
-    anime_count = await db.scalar(
-        select(func.count(Show.id)).where(*show_scope_filters, Show.media_type == "anime")
-    ) or 0
-
-    total_files = await db.scalar(select(func.count(MediaFile.id)).where(*media_scope_filters)) or 0
-
-    files_with_issues = await db.scalar(
-        select(func.count(MediaFile.id)).where(*media_scope_filters, MediaFile.has_issues == True)
-    ) or 0
-
-    missing_english_predicate = _build_issue_predicate(
-        "%Missing English audio track%",
-        "%Missing English audio for dual audio (anime)%",
-        "%missing_english%",
-    )
-    missing_japanese_predicate = _build_issue_predicate(
-        "%Missing Japanese audio track (anime)%",
-        "%Missing Japanese audio for dual audio (anime)%",
-        "%missing_japanese%",
-    )
-    missing_dual_audio_predicate = _build_issue_predicate(
-        "%Missing dual audio (English + Japanese) for anime%",
-        "%Missing English audio for dual audio (anime)%",
-        "%Missing Japanese audio for dual audio (anime)%",
-        "%missing_dual_audio%",
-    )
-
-    async def _count_by_issue_and_media_type(issue_predicate, media_type: str) -> int:
-        return (
-            await db.scalar(
-                select(func.count(MediaFile.id))
-                .join(Show, Show.id == MediaFile.show_id)
-                .where(
-                    MediaFile.user_id == current_user.id,
-                    Show.user_id == current_user.id,
-                    Show.media_type == media_type,
-                    issue_predicate,
-                )
-            )
-            or 0
+    # One aggregate pass per table; each counter is a FILTER on the same scan
+    total_titles, movie_count, tv_count, anime_count = (
+        await db.execute(
+            select(
+                func.count(Show.id),
+                func.count(Show.id).filter(Show.media_type == "movie"),
+                func.count(Show.id).filter(Show.media_type == "tv"),
+                func.count(Show.id).filter(Show.media_type == "anime"),
+            ).where(*show_scope_filters)
         )
+    ).one()
 
-    missing_english_count = await db.scalar(
-        select(func.count(MediaFile.id)).where(*media_scope_filters, missing_english_predicate)
-    ) or 0
-    missing_japanese_count = await db.scalar(
-        select(func.count(MediaFile.id)).where(*media_scope_filters, missing_japanese_predicate)
-    ) or 0
-    missing_dual_audio_count = await db.scalar(
-        select(func.count(MediaFile.id)).where(*media_scope_filters, missing_dual_audio_predicate)
-    ) or 0
-
-    missing_english_movies_count = await _count_by_issue_and_media_type(missing_english_predicate, "movie")
-    missing_english_tv_count = await _count_by_issue_and_media_type(missing_english_predicate, "tv")
-    missing_english_anime_count = await _count_by_issue_and_media_type(missing_english_predicate, "anime")
+    missing_english_predicate = MediaFile.issue_flags.bitwise_and(ISSUE_FLAG_MISSING_ENGLISH) != 0
+    missing_japanese_predicate = MediaFile.issue_flags.bitwise_and(ISSUE_FLAG_MISSING_JAPANESE) != 0
+    missing_dual_audio_predicate = (
+        MediaFile.issue_flags.bitwise_and(ISSUE_FLAG_MISSING_DUAL_AUDIO) != 0
+    )
 
-    missing_japanese_movies_count = await _count_by_issue_and_media_type(missing_japanese_predicate, "movie")
-    missing_japanese_tv_count = await _count_by_issue_and_media_type(missing_japanese_predicate, "tv")
-    missing_japanese_anime_count = await _count_by_issue_and_media_type(missing_japanese_predicate, "anime")
+    # Per issue: overall, then movie/tv/anime through the owning show
+    media_counters = [
+        func.count(MediaFile.id),
+        func.count(MediaFile.id).filter(MediaFile.has_issues == True),
+    ]
+    for issue_predicate in (
+        missing_english_predicate,
+        missing_japanese_predicate,
+        missing_dual_audio_predicate,
+    ):
+        media_counters.append(func.count(MediaFile.id).filter(issue_predicate))
+        media_counters.extend(
+            func.count(MediaFile.id).filter(issue_predicate, Show.media_type == media_type)
+            for media_type in ("movie", "tv", "anime")
+        )
 
-    missing_dual_audio_movies_count = await _count_by_issue_and_media_type(missing_dual_audio_predicate, "movie")
-    missing_dual_audio_tv_count = await _count_by_issue_and_media_type(missing_dual_audio_predicate, "tv")
-    missing_dual_audio_anime_count = await _count_by_issue_and_media_type(missing_dual_audio_predicate, "anime")
+    (
+        total_files,
+        files_with_issues,
+        missing_english_count,
+        missing_english_movies_count,
+        missing_english_tv_count,
+        missing_english_anime_count,
+        missing_japanese_count,
+        missing_japanese_movies_count,
+        missing_japanese_tv_count,
+        missing_japanese_anime_count,
+        missing_dual_audio_count,
+        missing_dual_audio_movies_count,
+        missing_dual_audio_tv_count,
+        missing_dual_audio_anime_count,
+    ) = (
+        await db.execute(
+            select(*media_counters)
+            .select_from(MediaFile)
+            .outerjoin(Show, and_(Show.id == MediaFile.show_id, *show_scope_filters))
+            .where(*media_scope_filters)
+        )
+    ).one()
 
     last_scan = await db.scalar(
         select(func.max(ScanLocation.last_scanned)).where(*scan_scope_filters)
@@ -499,7 +511,8 @@ async def list_shows(
         d_issues = row[5]
 
         show_responses.append(
-            ShowResponse(
+            ShowResponse.model_construct(
+                _SHOW_FIELDS,
                 id=show.id,
                 title=show.title,
                 media_type=show.media_type,
@@ -573,7 +586,8 @@ async def get_show(
     for season in sorted(show.seasons, key=lambda s: s.season_number):
         counts = season_counts.get(season.id, {"episodes": 0, "issues": 0})
         season_responses.append(
-            SeasonResponse(
+            SeasonResponse.model_construct(
+                _SEASON_FIELDS,
                 id=season.id,
                 season_number=season.season_number,
                 episode_count=counts["episodes"],
@@ -747,11 +761,11 @@ async def list_media_files(
         issue_category=issue_category,
     )
 
-    query = select(MediaFile).options(selectinload(MediaFile.audio_tracks)).where(*filters)
-
-    count_query = select(func.count()).select_from(query.subquery())
-    total = await db.scalar(count_query) or 0
+    # Count straight off the filters; wrapping the entity query in a subquery
+    # would select every column just to count rows
+    total = await db.scalar(select(func.count(MediaFile.id)).where(*filters)) or 0
 
+    query = select(MediaFile).options(selectinload(MediaFile.audio_tracks)).where(*filters)
     query = query.order_by(MediaFile.file_path).offset((page - 1) * page_size).limit(page_size)
 
     result = await db.execute(query)
@@ -814,7 +828,7 @@ async def update_media_file_default_audio(
     if not track_dicts:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No audio tracks found")
 
-    if not set_default_track_by_language(mf.file_path, track_dicts, target_language):
+    if not await set_default_track_by_language_async(mf.file_path, track_dicts, target_language):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Unable to set default audio track. Ensure the file is MKV, mkvpropedit is installed, and the language exists.",
@@ -969,19 +983,18 @@ async def export_media_files(
     )
     files = result.scalars().all()
 
-    if format == "json":
-        payload = Exporter.export_media_files_json(files)
-        media_type = "application/json"
-        filename = "trackhound-files-export.json"
-    else:
-        payload = Exporter.export_media_files_csv(files)
-        media_type = "text/csv"
-        filename = "trackhound-files-export.csv"
+    if format != "json":
+        # Streamed, so the CSV text is written out chunk by chunk
+        return StreamingResponse(
+            Exporter.iter_media_files_csv(files),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="trackhound-files-export.csv"'},
+        )
 
     return Response(
-        content=payload,
-        media_type=media_type,
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        content=Exporter.export_media_files_json(files),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="trackhound-files-export.json"'},
     )
 
 
@@ -1,5 +1,7 @@
 """Scan API endpoints for managing scan locations and running scans."""
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
 
@@ -55,6 +57,12 @@ def _validate_scan_media_type(value: ScanMediaType | str) -> str:
     raise _invalid_scan_input("media_type must be one of: tv, movie, anime.")
 
 
+@lru_cache(maxsize=8)
+def _resolved_media_root(media_root: str) -> Path:
+    """Resolve the media root once per configured value."""
+    return Path(media_root).resolve()
+
+
 def resolve_media_path(path: str) -> Path:
     """Resolve and validate that a path stays within the scan media root.
 
@@ -62,7 +70,10 @@ def resolve_media_path(path: str) -> Path:
     callers that validate directory traversal constraints directly from this
     module.
     """
-    media_root = Path(MEDIA_ROOT).resolve()
+    # Only the root is memoized (keyed by MEDIA_ROOT, so reassigning it is
+    # picked up); candidates are always resolved afresh, because a cached
+    # answer would miss a symlink swapped to point outside the root
+    media_root = _resolved_media_root(MEDIA_ROOT)
     candidate = Path(path)
 
     if not candidate.is_absolute():
@@ -104,26 +115,29 @@ async def browse_directories(
     except ValueError as exc:
         raise _invalid_scan_input(str(exc)) from exc
 
-    resolved = Path(resolved_path)
-    if not resolved.exists() or not resolved.is_dir():
+    # One scandir call both checks the directory and lists it; DirEntry.is_dir()
+    # answers from the directory listing, so most entries need no extra stat
+    try:
+        with os.scandir(resolved_path) as entries:
+            directories = [
+                DirectoryEntry(name=entry.name, path=entry.path)
+                for entry in entries
+                if not entry.name.startswith(".") and entry.is_dir()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Directory not found",
         )
-
-    directories = []
-    try:
-        for entry in sorted(resolved.iterdir()):
-            if entry.is_dir() and not entry.name.startswith("."):
-                directories.append(DirectoryEntry(name=entry.name, path=str(entry)))
     except PermissionError:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Permission denied",
         )
+    directories.sort(key=lambda directory: directory.name)
 
     return DirectoryBrowseResponse(
-        current_path=str(resolved),
+        current_path=resolved_path,
         directories=directories,
     )
 
@@ -4,8 +4,8 @@ import json
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import ValidationError
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import TypeAdapter, ValidationError
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -26,6 +26,19 @@ DEFAULT_AUDIO_PREFERENCES = AudioPreferences()
 DEFAULT_ANIME_DETECTION = AnimeDetectionSettings()
 DEFAULT_FILE_EXTENSIONS = [".mkv", ".mp4", ".avi", ".m4v"]
 
+# Prebuilt validators/serializers reused across requests
+_AUDIO_ADAPTER = TypeAdapter(AudioPreferences)
+_ANIME_ADAPTER = TypeAdapter(AnimeDetectionSettings)
+
+SETTINGS_KEYS = ("audio_preferences", "anime_detection", "file_extensions")
+
+# Serialized once for users who have not saved any settings yet
+_DEFAULT_RESPONSE_JSON = UserSettingsResponse(
+    audio_preferences=DEFAULT_AUDIO_PREFERENCES,
+    anime_detection=DEFAULT_ANIME_DETECTION,
+    file_extensions=DEFAULT_FILE_EXTENSIONS,
+).model_dump_json().encode()
+
 
 async def get_user_preference(
     db: AsyncSession, user_id: int, key: str
@@ -41,6 +54,19 @@ async def get_user_preference(
     return pref.value if pref else None
 
 
+async def get_user_preferences(
+    db: AsyncSession, user_id: int, keys: tuple[str, ...]
+) -> dict[str, str]:
+    """Get several user preference values with a single query."""
+    result = await db.execute(
+        select(UserPreference.key, UserPreference.value).where(
+            UserPreference.user_id == user_id,
+            UserPreference.key.in_(keys),
+        )
+    )
+    return {key: value for key, value in result.all()}
+
+
 async def set_user_preference(
     db: AsyncSession, user_id: int, key: str, value: str
 ) -> None:
@@ -60,34 +86,30 @@ async def set_user_preference(
         db.add(pref)
 
 
-@router.get("", response_model=UserSettingsResponse)
-async def get_settings(
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-):
-    """Get user settings."""
+def _build_settings_response(values: dict[str, str]) -> UserSettingsResponse:
+    """Parse stored preference values, falling back to defaults per key."""
     # Audio preferences
-    audio_json = await get_user_preference(db, current_user.id, "audio_preferences")
+    audio_json = values.get("audio_preferences")
     if audio_json:
         try:
-            audio_prefs = AudioPreferences.model_validate_json(audio_json)
+            audio_prefs = _AUDIO_ADAPTER.validate_json(audio_json)
         except ValidationError:
             audio_prefs = DEFAULT_AUDIO_PREFERENCES
     else:
         audio_prefs = DEFAULT_AUDIO_PREFERENCES
 
     # Anime detection
-    anime_json = await get_user_preference(db, current_user.id, "anime_detection")
+    anime_json = values.get("anime_detection")
     if anime_json:
         try:
-            anime_detection = AnimeDetectionSettings.model_validate_json(anime_json)
+            anime_detection = _ANIME_ADAPTER.validate_json(anime_json)
         except ValidationError:
             anime_detection = DEFAULT_ANIME_DETECTION
     else:
         anime_detection = DEFAULT_ANIME_DETECTION
 
     # File extensions
-    ext_json = await get_user_preference(db, current_user.id, "file_extensions")
+    ext_json = values.get("file_extensions")
     if ext_json:
         try:
             file_extensions = json.loads(ext_json)
@@ -103,6 +125,19 @@ async def get_settings(
     )
 
 
+@router.get("", response_model=UserSettingsResponse)
+async def get_settings(
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+):
+    """Get user settings."""
+    values = await get_user_preferences(db, current_user.id, SETTINGS_KEYS)
+    if not values:
+        return Response(content=_DEFAULT_RESPONSE_JSON, media_type="application/json")
+
+    return _build_settings_response(values)
+
+
 @router.put("", response_model=UserSettingsResponse)
 async def update_settings(
     updates: UserSettingsUpdate,
@@ -115,7 +150,7 @@ async def update_settings(
             db,
             current_user.id,
             "audio_preferences",
-            updates.audio_preferences.model_dump_json(),
+            _AUDIO_ADAPTER.dump_json(updates.audio_preferences).decode(),
         )
 
     if updates.anime_detection is not None:
@@ -123,7 +158,7 @@ async def update_settings(
             db,
             current_user.id,
             "anime_detection",
-            updates.anime_detection.model_dump_json(),
+            _ANIME_ADAPTER.dump_json(updates.anime_detection).decode(),
         )
 
     if updates.file_extensions is not None:
@@ -136,8 +171,37 @@ async def update_settings(
 
     await db.flush()
 
-    # Return updated settings
-    return await get_settings(current_user, db)
+    # Build the response from the update itself; only untouched keys are read back.
+    missing_keys = tuple(
+        key
+        for key, value in zip(
+            SETTINGS_KEYS,
+            (updates.audio_preferences, updates.anime_detection, updates.file_extensions),
+        )
+        if value is None
+    )
+    stored_values = (
+        await get_user_preferences(db, current_user.id, missing_keys) if missing_keys else {}
+    )
+    stored = _build_settings_response(stored_values)
+
+    return UserSettingsResponse(
+        audio_preferences=(
+            updates.audio_preferences
+            if updates.audio_preferences is not None
+            else stored.audio_preferences
+        ),
+        anime_detection=(
+            updates.anime_detection
+            if updates.anime_detection is not None
+            else stored.anime_detection
+        ),
+        file_extensions=(
+            updates.file_extensions
+            if updates.file_extensions is not None
+            else stored.file_extensions
+        ),
+    )
 
 
 @router.delete("")
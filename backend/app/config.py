@@ -2,7 +2,7 @@
 
 import logging
 import warnings
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -78,7 +78,7 @@ class Settings(BaseSettings):
                 stacklevel=2,
             )
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS origins into a list, filtering empty strings."""
         return [
@@ -87,12 +87,12 @@ class Settings(BaseSettings):
             if origin.strip()
         ]
 
-    @property
+    @cached_property
     def is_sqlite(self) -> bool:
         """Check if using SQLite database."""
         return self.database_url.startswith("sqlite")
 
-    @property
+    @cached_property
     def is_postgres(self) -> bool:
         """Check if using PostgreSQL database."""
         return self.database_url.startswith("postgresql")
@@ -1,5 +1,6 @@
 """Audio track analyzer using pymediainfo."""
 
+import os
 from typing import Optional
 
 # Language code mappings
@@ -50,6 +51,14 @@ LANGUAGE_MAP = {
     "hindi": "hi",
 }
 
+# Lookup table for normalize_language: LANGUAGE_MAP plus ISO 639-1 codes mapped
+# to themselves so known codes resolve with a single dict hit. Kept separate
+# from LANGUAGE_MAP because its keys are also matched against track titles.
+_LANGUAGE_LOOKUP = {
+    **{code: code for code in LANGUAGE_MAP.values() if code},
+    **LANGUAGE_MAP,
+}
+
 
 def normalize_language(lang_code: Optional[str]) -> Optional[str]:
     """
@@ -66,13 +75,10 @@ def normalize_language(lang_code: Optional[str]) -> Optional[str]:
     
     code = lang_code.lower().strip()
     
-    # Already ISO 639-1
-    if len(code) == 2 and code != "un":
-        return code
-    
-    # Check mapping
-    if code in LANGUAGE_MAP:
-        return LANGUAGE_MAP[code]
+    try:
+        return _LANGUAGE_LOOKUP[code]
+    except KeyError:
+        pass
     
     # Return original if unknown (might be valid ISO 639-1)
     return code[:2] if len(code) >= 2 else None
@@ -99,6 +105,8 @@ class AudioAnalyzer:
 
     def __init__(self):
         self._mediainfo_available = None
+        # pymediainfo's MediaInfo class, resolved once by _check_mediainfo
+        self._media_info = None
 
     def _check_mediainfo(self) -> bool:
         """Check if pymediainfo is available and working."""
@@ -107,6 +115,7 @@ class AudioAnalyzer:
                 from pymediainfo import MediaInfo
                 # Try to parse nothing to see if libmediainfo is installed
                 MediaInfo.can_parse()
+                self._media_info = MediaInfo
                 self._mediainfo_available = True
             except Exception:
                 self._mediainfo_available = False
@@ -121,15 +130,15 @@ class AudioAnalyzer:
                 - container: Container format (e.g., "Matroska")
                 - duration_ms: Duration in milliseconds
                 - audio_tracks: List of audio track dicts
+                - english_track_index: Index of the first English track, or None
+                - default_track_index: Index of the first default track, or None
         """
         if not self._check_mediainfo():
             # Fallback if mediainfo not available
             return self._fallback_analyze(file_path)
 
         try:
-            from pymediainfo import MediaInfo
-            
-            media_info = MediaInfo.parse(file_path)
+            media_info = self._media_info.parse(file_path)
             
             result = {
                 "container": None,
@@ -145,8 +154,10 @@ class AudioAnalyzer:
                         result["duration_ms"] = int(float(track.duration))
                     break
             
-            # Get audio tracks
+            # Get audio tracks; the auto-fix lookups are recorded on the way
             audio_index = 0
+            english_track_index = None
+            default_track_index = None
             for track in media_info.tracks:
                 if track.track_type == "Audio":
                     # Safely extract language, handling empty other_language lists
@@ -185,8 +196,14 @@ class AudioAnalyzer:
                         "title": track.title,
                     }
                     result["audio_tracks"].append(audio_track)
+                    if english_track_index is None and detected_lang == "en":
+                        english_track_index = audio_index
+                    if default_track_index is None and audio_track["is_default"]:
+                        default_track_index = audio_index
                     audio_index += 1
             
+            result["english_track_index"] = english_track_index
+            result["default_track_index"] = default_track_index
             return result
             
         except Exception as e:
@@ -200,8 +217,6 @@ class AudioAnalyzer:
 
     def _fallback_analyze(self, file_path: str) -> dict:
         """Fallback analysis when pymediainfo is not available."""
-        import os
-        
         # Try to detect container from extension
         ext = os.path.splitext(file_path)[1].lower()
         container_map = {
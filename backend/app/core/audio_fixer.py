@@ -1,7 +1,10 @@
 """Utilities for updating and pruning MKV audio tracks."""
 
+import asyncio
 from dataclasses import dataclass
+import functools
 import json
+import os
 from pathlib import Path
 import shutil
 import subprocess
@@ -9,6 +12,10 @@ import subprocess
 from app.core.analyzer import normalize_language
 
 
+# Caps concurrent mkvpropedit processes when defaults are fixed from async callers.
+_MKVPROPEDIT_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 1)
+
+
 class AudioTrackRemovalError(RuntimeError):
     """Raised when an audio track removal request cannot be completed safely."""
 
@@ -22,39 +29,60 @@ class AudioTrackRemovalResult:
     backup_path: str | None
 
 
+@functools.cache
+def _mkvpropedit_path() -> str | None:
+    """Return the mkvpropedit executable path, resolved once per process."""
+    return shutil.which("mkvpropedit")
+
+
 def find_track_index_for_language(audio_tracks: list[dict], language: str) -> int | None:
     """Find the first audio track index matching the requested language."""
     normalized = (language or "").lower().strip()
     for track in audio_tracks:
-        track_language = (track.get("language") or "").lower()
         track_index = track.get("index")
-        if track_language == normalized and isinstance(track_index, int):
+        if isinstance(track_index, int) and (track.get("language") or "").lower() == normalized:
             return track_index
     return None
 
 
-def set_default_track_by_index(file_path: str, audio_tracks: list[dict], track_index: int) -> bool:
-    """Set the provided audio track index as default for an MKV file."""
+def _build_set_default_command(
+    file_path: str, audio_tracks: list[dict], track_index: int
+) -> list[str] | None:
+    """Build the mkvpropedit command that makes `track_index` the default track.
+
+    The target track is always written, so the file is updated even when the
+    stored flags are stale. Other tracks are only cleared when their stored
+    flag is not already False. Returns None when the file cannot be updated.
+    """
     if Path(file_path).suffix.lower() != ".mkv":
-        return False
+        return None
 
-    if shutil.which("mkvpropedit") is None:
-        return False
+    if _mkvpropedit_path() is None:
+        return None
 
-    valid_indexes = sorted(
-        {
-            track.get("index")
-            for track in audio_tracks
-            if isinstance(track.get("index"), int)
-        }
-    )
-    if track_index not in valid_indexes:
-        return False
+    # Tracks arrive in index order, so one pass keeps the order without sorting.
+    default_by_index: dict[int, bool | None] = {}
+    for track in audio_tracks:
+        idx = track.get("index")
+        if isinstance(idx, int):
+            default_by_index.setdefault(idx, track.get("is_default"))
+    if track_index not in default_by_index:
+        return None
 
     command = ["mkvpropedit", file_path]
-    for idx in valid_indexes:
-        command.extend(["--edit", f"track:a{idx + 1}", "--set", "flag-default=0"])
-    command.extend(["--edit", f"track:a{track_index + 1}", "--set", "flag-default=1"])
+    for idx, is_default in default_by_index.items():
+        if idx == track_index:
+            command.extend(["--edit", f"track:a{idx + 1}", "--set", "flag-default=1"])
+        elif is_default is not False:
+            command.extend(["--edit", f"track:a{idx + 1}", "--set", "flag-default=0"])
+    return command
+
+
+def set_default_track_by_index(file_path: str, audio_tracks: list[dict], track_index: int) -> bool:
+    """Set the provided audio track index as default for an MKV file."""
+    command = _build_set_default_command(file_path, audio_tracks, track_index)
+    if command is None:
+        return False
 
     try:
         subprocess.run(command, check=True, capture_output=True, text=True)
@@ -63,6 +91,24 @@ def set_default_track_by_index(file_path: str, audio_tracks: list[dict], track_i
         return False
 
 
+async def set_default_track_by_index_async(
+    file_path: str, audio_tracks: list[dict], track_index: int
+) -> bool:
+    """Async variant of `set_default_track_by_index` that does not block the event loop."""
+    command = _build_set_default_command(file_path, audio_tracks, track_index)
+    if command is None:
+        return False
+
+    async with _MKVPROPEDIT_SEMAPHORE:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        await process.communicate()
+    return process.returncode == 0
+
+
 def set_default_track_by_language(file_path: str, audio_tracks: list[dict], language: str) -> bool:
     """Set the first track matching the language as default for an MKV file."""
     target_index = find_track_index_for_language(audio_tracks, language)
@@ -71,6 +117,16 @@ def set_default_track_by_language(file_path: str, audio_tracks: list[dict], lang
     return set_default_track_by_index(file_path, audio_tracks, target_index)
 
 
+async def set_default_track_by_language_async(
+    file_path: str, audio_tracks: list[dict], language: str
+) -> bool:
+    """Async variant of `set_default_track_by_language`."""
+    target_index = find_track_index_for_language(audio_tracks, language)
+    if target_index is None:
+        return False
+    return await set_default_track_by_index_async(file_path, audio_tracks, target_index)
+
+
 def _track_language_tokens(track: dict) -> set[str]:
     """Return normalized language tokens that can match user keep settings."""
     tokens: set[str] = set()
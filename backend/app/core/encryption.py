@@ -2,6 +2,7 @@
 
 import base64
 import hashlib
+from functools import lru_cache
 
 from cryptography.fernet import Fernet, InvalidToken
 
@@ -23,9 +24,15 @@ def _derive_key(raw_key: str) -> bytes:
     return base64.urlsafe_b64encode(digest)
 
 
+@lru_cache(maxsize=4)
+def _cipher_for_key(raw_key: str) -> Fernet:
+    return Fernet(_derive_key(raw_key))
+
+
 def _cipher() -> Fernet:
-    settings = get_settings()
-    return Fernet(_derive_key(settings.encryption_key))
+    # Keyed on the configured material, so the token backfill and each login
+    # reuse one cipher instead of re-deriving the key per value
+    return _cipher_for_key(get_settings().encryption_key)
 
 
 def is_encrypted(value: str | None) -> bool:
@@ -1,18 +1,96 @@
 """Plex Media Server connector for metadata retrieval."""
 
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import logging
-import os
 import re
+import sys
 from typing import Optional
 from dataclasses import dataclass, field
 
+from rapidfuzz import fuzz, process, utils
+
 logger = logging.getLogger(__name__)
 
+_SEASON_EP_RE = re.compile(r's\d+e\d+')
+_YEAR_PAREN_RE = re.compile(r'\s*\(\d{4}\)\s*$')
+_YEAR_BRACK_RE = re.compile(r'\s*\[\d{4}\]\s*$')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+# ASCII equivalent of _NON_WORD_RE.sub('', ...) as a translate table
+_PUNCT_DROP = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128)
+    if not (chr(c).isalnum() or chr(c).isspace() or chr(c) == '_')
+))
+
+_ANIME_GENRES = frozenset({"anime", "animation", "アニメ"})
+
+# Cap on concurrent per-show episode requests to the Plex server
+_EPISODE_FETCH_WORKERS = 16
+
+
+# ASCII lowercase + backslash -> slash in a single translate pass
+_PATH_TRANS = str.maketrans(
+    {chr(c): chr(c + 32) for c in range(ord('A'), ord('Z') + 1)} | {'\\': '/'}
+)
+_BACKSLASH_TRANS = str.maketrans({'\\': '/'})
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_path(path: str) -> str:
+    """Normalize file path for comparison (memoized across connectors)."""
+    if path.isascii():
+        return path.translate(_PATH_TRANS)
+    # Non-ASCII names (accented/CJK titles) still need full Unicode lowercasing
+    return path.lower().translate(_BACKSLASH_TRANS)
+
+
+def _strip_punctuation(text: str) -> str:
+    """Drop non-word characters, using the translate table for ASCII text."""
+    if text.isascii():
+        return text.translate(_PUNCT_DROP).strip()
+    return _NON_WORD_RE.sub('', text).strip()
 
-@dataclass
+
+def _parent_and_filename(normalized_path: str) -> tuple[str, str]:
+    """Split a normalized path into its parent folder name and filename."""
+    directory, _, filename = normalized_path.rpartition('/')
+    return directory.rpartition('/')[2], filename
+
+
+@dataclass(frozen=True, slots=True)
+class _PathKey:
+    """A file path split into its lookup components once per request."""
+    file_path: str
+    normalized: str
+    filename: str  # lowercased basename
+    parent_dir: str  # lowercased parent folder name
+    parts: tuple[str, ...]  # original-case path segments
+
+    @classmethod
+    def from_path(cls, file_path: str) -> "_PathKey":
+        normalized = _normalize_path(file_path)
+        parent_dir, filename = _parent_and_filename(normalized)
+        return cls(
+            file_path=file_path,
+            normalized=normalized,
+            filename=filename,
+            parent_dir=parent_dir,
+            parts=tuple(file_path.translate(_BACKSLASH_TRANS).split('/')),
+        )
+
+
+def _as_path_key(file_path: "str | _PathKey") -> _PathKey:
+    """Accept either a raw path or an already split _PathKey."""
+    if isinstance(file_path, _PathKey):
+        return file_path
+    return _PathKey.from_path(file_path)
+
+
+@dataclass(slots=True)
 class PlexShow:
     """Plex show information."""
-    rating_key: str
+    rating_key: int
     title: str  # Display title (often romanji for anime)
     original_title: Optional[str]  # Original title (often English for anime)
     year: Optional[int]
@@ -25,10 +103,10 @@ class PlexShow:
     title_variants: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class PlexEpisode:
     """Plex episode information."""
-    rating_key: str
+    rating_key: int
     title: str
     season_number: int
     episode_number: int
@@ -50,8 +128,17 @@ class PlexConnector:
         self.server_url = server_url
         self._server = None
         self._shows_cache: dict[str, PlexShow] = {}  # title variant -> show
+        # punctuation-stripped title variant -> show
+        self._normalized_cache: dict[str, PlexShow] = {}
         self._file_path_cache: dict[str, PlexShow] = {}  # normalized path -> show
-        self._shows_by_key: dict[str, PlexShow] = {}  # rating_key -> show
+        # (parent folder, filename) -> show, for paths that differ only by mount root
+        self._file_basename_cache: dict[tuple[str, str], PlexShow] = {}
+        self._shows_by_key: dict[int, PlexShow] = {}  # rating_key -> show
+        # Fuzzy matching runs against each show's own titles only, not every variant
+        self._canonical_titles: list[str] = []
+        self._canonical_shows: list[PlexShow] = []
+        self._find_show_cache: dict[str, Optional[PlexShow]] = {}  # query -> match (or miss)
+        self._episodes_cache: dict[int, list[PlexEpisode]] = {}  # rating_key -> episodes
 
     def _get_server(self):
         """Get or create Plex server connection."""
@@ -89,20 +176,18 @@ class PlexConnector:
 
     def _normalize_path(self, path: str) -> str:
         """Normalize file path for comparison."""
-        # Convert to lowercase and normalize slashes
-        return path.lower().replace('\\', '/')
+        return _normalize_path(path)
 
-    def _extract_show_folder(self, file_path: str) -> Optional[str]:
+    def _extract_show_folder(self, file_path: str | _PathKey) -> Optional[str]:
         """Extract the show folder name from a file path."""
-        # Normalize path
-        path = file_path.replace('\\', '/')
-        parts = path.split('/')
+        parts = _as_path_key(file_path).parts
         
         # Look for common patterns:
         # /media/anime/Show Name/Season 01/episode.mkv
         # /media/tv/Show Name/S01E01.mkv
         for i, part in enumerate(parts):
-            if part.lower().startswith('season') or re.match(r's\d+e\d+', part.lower()):
+            part_lower = part.lower()
+            if part_lower.startswith('season') or _SEASON_EP_RE.match(part_lower):
                 if i > 0:
                     return parts[i - 1]
         
@@ -124,8 +209,8 @@ class PlexConnector:
             variants.add(t_lower)
             
             # Remove common suffixes/prefixes
-            cleaned = re.sub(r'\s*\(\d{4}\)\s*$', '', t_lower)  # Remove (2020)
-            cleaned = re.sub(r'\s*\[\d{4}\]\s*$', '', cleaned)  # Remove [2020]
+            cleaned = _YEAR_PAREN_RE.sub('', t_lower)  # Remove (2020)
+            cleaned = _YEAR_BRACK_RE.sub('', cleaned)  # Remove [2020]
             variants.add(cleaned.strip())
             
             # Remove "the" prefix
@@ -133,7 +218,7 @@ class PlexConnector:
                 variants.add(cleaned[4:].strip())
             
             # Replace special characters
-            normalized = re.sub(r'[^\w\s]', '', cleaned)
+            normalized = _NON_WORD_RE.sub('', cleaned)
             variants.add(normalized.strip())
             
             # Handle common Japanese/English title patterns
@@ -145,7 +230,8 @@ class PlexConnector:
             if ' - ' in t_lower:
                 variants.add(t_lower.split(' - ')[0].strip())
         
-        return list(variants)
+        # Interned so the same variant string is shared across shows and caches
+        return [sys.intern(variant) for variant in variants]
 
     def get_libraries(self) -> list[dict]:
         """Get list of Plex libraries."""
@@ -171,75 +257,134 @@ class PlexConnector:
         """
         server = self._get_server()
         shows = []
-        
+        self._find_show_cache = {}
+        self._episodes_cache = {}
+        self._canonical_titles = []
+        self._canonical_shows = []
+        
+        plex_shows = []
+        fallback_shows = []
+        file_paths_by_show: dict[int, list[str]] = {}
         for section in server.library.sections():
             if section.type != "show":
                 continue
             if library_name and section.title != library_name:
                 continue
+            section_shows = section.all()
+            plex_shows.extend(section_shows)
+            try:
+                file_paths_by_show.update(self._bulk_episode_fetch(server, section))
+            except Exception as e:
+                logger.warning(
+                    "Bulk episode fetch failed for library '%s', falling back to per-show requests: %s",
+                    section.title,
+                    e,
+                )
+                fallback_shows.extend(section_shows)
+        
+        # Per-show listings are one HTTP request each; fetch them concurrently
+        if fallback_shows:
+            with ThreadPoolExecutor(max_workers=_EPISODE_FETCH_WORKERS) as pool:
+                for show, file_paths in zip(
+                    fallback_shows, pool.map(self._fetch_show_file_paths, fallback_shows)
+                ):
+                    file_paths_by_show[show.ratingKey] = file_paths
+        
+        for show in plex_shows:
+            file_paths = file_paths_by_show.get(show.ratingKey, [])
+            genres = [g.tag for g in (getattr(show, 'genres', None) or [])]
+            is_anime = self._is_anime(genres)
             
-            for show in section.all():
-                genres = [g.tag for g in (getattr(show, 'genres', None) or [])]
-                is_anime = self._is_anime(genres)
-                
-                # Get both title and original title
-                title = show.title
-                original_title = getattr(show, 'originalTitle', None)
-                
-                # Generate all title variants
-                title_variants = self._generate_title_variants(title, original_title)
-                
-                # Get all file paths for this show
-                file_paths = []
-                try:
-                    for episode in show.episodes():
-                        if episode.media:
-                            for media in episode.media:
-                                for part in media.parts:
-                                    if part.file:
-                                        file_paths.append(part.file)
-                except Exception as e:
-                    logger.warning("Failed to get episodes for show '%s': %s", title, e)
-                
-                plex_show = PlexShow(
-                    rating_key=str(show.ratingKey),
-                    title=title,
-                    original_title=original_title,
-                    year=getattr(show, 'year', None),
-                    genres=genres,
-                    thumb_url=show.thumbUrl if hasattr(show, 'thumbUrl') else None,
-                    is_anime=is_anime,
-                    file_paths=file_paths,
-                    title_variants=title_variants,
+            # Get both title and original title
+            title = show.title
+            original_title = getattr(show, 'originalTitle', None)
+            
+            # Generate all title variants
+            title_variants = self._generate_title_variants(title, original_title)
+            
+            plex_show = PlexShow(
+                rating_key=show.ratingKey,
+                title=title,
+                original_title=original_title,
+                year=getattr(show, 'year', None),
+                genres=genres,
+                thumb_url=show.thumbUrl if hasattr(show, 'thumbUrl') else None,
+                is_anime=is_anime,
+                file_paths=file_paths,
+                title_variants=title_variants,
+            )
+            shows.append(plex_show)
+            
+            # Cache by rating key
+            self._shows_by_key[plex_show.rating_key] = plex_show
+            
+            # Cache all title variants
+            for variant in title_variants:
+                self._shows_cache[variant] = plex_show
+                self._normalized_cache[_strip_punctuation(variant)] = plex_show
+            
+            for canonical in dict.fromkeys(
+                t.lower().strip() for t in (title, original_title) if t
+            ):
+                self._canonical_titles.append(sys.intern(canonical))
+                self._canonical_shows.append(plex_show)
+            
+            # Cache file paths for quick lookup
+            for fp in file_paths:
+                path_key = _PathKey.from_path(fp)
+                self._file_path_cache[sys.intern(path_key.normalized)] = plex_show
+                self._file_basename_cache.setdefault(
+                    (path_key.parent_dir, path_key.filename), plex_show
                 )
-                shows.append(plex_show)
-                
-                # Cache by rating key
-                self._shows_by_key[plex_show.rating_key] = plex_show
                 
-                # Cache all title variants
-                for variant in title_variants:
-                    self._shows_cache[variant] = plex_show
-                
-                # Cache file paths for quick lookup
-                for fp in file_paths:
-                    normalized = self._normalize_path(fp)
-                    self._file_path_cache[normalized] = plex_show
-                    
-                    # Also cache the show folder name
-                    folder = self._extract_show_folder(fp)
-                    if folder:
-                        self._shows_cache[folder.lower()] = plex_show
+                # Also cache the show folder name
+                folder = self._extract_show_folder(path_key)
+                if folder:
+                    folder_lower = sys.intern(folder.lower())
+                    self._shows_cache[folder_lower] = plex_show
+                    self._normalized_cache[_strip_punctuation(folder_lower)] = plex_show
         
         return shows
 
+    def _bulk_episode_fetch(self, server, section) -> dict[int, list[str]]:
+        """
+        Collect episode file paths for a whole library section in one request.
+        
+        Returns a mapping of show rating key -> file paths, parsed from the
+        raw episode listing instead of walking each show's episodes.
+        """
+        data = server.query(f"/library/sections/{section.key}/all?type=4&includeMedia=1")
+        file_paths_by_show: dict[int, list[str]] = defaultdict(list)
+        for video in data.iter("Video"):
+            show_key = video.attrib.get("grandparentRatingKey")
+            if not show_key:
+                continue
+            file_paths = file_paths_by_show[int(show_key)]
+            for part in video.iter("Part"):
+                file_path = part.attrib.get("file")
+                if file_path:
+                    file_paths.append(file_path)
+        return dict(file_paths_by_show)
+
+    def _fetch_show_file_paths(self, show) -> list[str]:
+        """Collect media file paths for every episode of a Plex show."""
+        file_paths = []
+        try:
+            for episode in show.episodes():
+                if episode.media:
+                    for media in episode.media:
+                        for part in media.parts:
+                            if part.file:
+                                file_paths.append(part.file)
+        except Exception as e:
+            logger.warning("Failed to get episodes for show '%s': %s", show.title, e)
+        return file_paths
+
     def _is_anime(self, genres: list[str]) -> bool:
         """Check if genres indicate anime."""
-        anime_genres = {"anime", "animation", "アニメ"}
-        genre_lower = {g.lower() for g in genres}
-        return bool(anime_genres & genre_lower)
+        return any(g.lower() in _ANIME_GENRES for g in genres)
 
-    def find_show_by_file(self, file_path: str) -> Optional[PlexShow]:
+    def find_show_by_file(self, file_path: str | _PathKey) -> Optional[PlexShow]:
         """
         Find a show by matching the file path.
         
@@ -249,25 +394,15 @@ class PlexConnector:
         if not self._file_path_cache:
             self.get_tv_shows()
         
-        normalized = self._normalize_path(file_path)
+        path_key = _as_path_key(file_path)
         
         # Try exact match first
-        if normalized in self._file_path_cache:
-            return self._file_path_cache[normalized]
+        if path_key.normalized in self._file_path_cache:
+            return self._file_path_cache[path_key.normalized]
         
-        # Try matching by parent directories
+        # Try matching by parent directory + filename
         # This handles cases where container paths differ from Plex paths
-        filename = os.path.basename(file_path).lower()
-        
-        for cached_path, show in self._file_path_cache.items():
-            if os.path.basename(cached_path).lower() == filename:
-                # Same filename - check if parent folder matches too
-                cached_parent = os.path.basename(os.path.dirname(cached_path)).lower()
-                file_parent = os.path.basename(os.path.dirname(file_path)).lower()
-                if cached_parent == file_parent:
-                    return show
-        
-        return None
+        return self._file_basename_cache.get((path_key.parent_dir, path_key.filename))
 
     def find_show(self, title: str) -> Optional[PlexShow]:
         """
@@ -281,30 +416,44 @@ class PlexConnector:
         
         title_lower = title.lower().strip()
         
+        # Repeated titles during a scan reuse the earlier result, hit or miss
+        try:
+            return self._find_show_cache[title_lower]
+        except KeyError:
+            pass
+        
+        show = self._match_show_title(title_lower)
+        self._find_show_cache[title_lower] = show
+        return show
+
+    def _match_show_title(self, title_lower: str) -> Optional[PlexShow]:
+        """Match a lowercased title against cached variants, then fuzzily."""
         # Try exact match against all cached variants
         if title_lower in self._shows_cache:
             return self._shows_cache[title_lower]
         
-        # Try normalized version
-        normalized = re.sub(r'[^\w\s]', '', title_lower).strip()
-        if normalized in self._shows_cache:
-            return self._shows_cache[normalized]
-        
-        # Try fuzzy match
-        best_match = None
-        best_score = 0
+        # Try normalized version against the normalized variants
+        show = self._normalized_cache.get(_strip_punctuation(title_lower))
+        if show:
+            return show
         
-        for cached_title, show in self._shows_cache.items():
-            score = self._similarity(title_lower, cached_title)
-            if score > best_score and score > 0.75:  # 75% threshold
-                best_score = score
-                best_match = show
+        # Try fuzzy match (75% threshold) against canonical titles; score_cutoff
+        # lets rapidfuzz skip hopeless candidates in C
+        match = process.extractOne(
+            title_lower,
+            self._canonical_titles,
+            scorer=fuzz.WRatio,
+            processor=utils.default_process,
+            score_cutoff=75,
+        )
+        if match:
+            return self._canonical_shows[match[2]]
         
-        return best_match
+        return None
 
     def find_show_by_path_or_title(
         self,
-        file_path: str,
+        file_path: str | _PathKey,
         title_from_path: Optional[str] = None,
     ) -> Optional[PlexShow]:
         """
@@ -319,8 +468,15 @@ class PlexConnector:
         if show:
             return show
         
+        return self._find_show_by_titles(self._extract_show_folder(file_path), title_from_path)
+
+    def _find_show_by_titles(
+        self,
+        folder_name: Optional[str],
+        title_from_path: Optional[str],
+    ) -> Optional[PlexShow]:
+        """Title strategies of find_show_by_path_or_title, after a path miss."""
         # Strategy 2: Match by folder name from file path
-        folder_name = self._extract_show_folder(file_path)
         if folder_name:
             show = self.find_show(folder_name)
             if show:
@@ -334,52 +490,17 @@ class PlexConnector:
         
         return None
 
-    def _similarity(self, s1: str, s2: str) -> float:
-        """Calculate similarity between two strings using multiple methods."""
-        if s1 == s2:
-            return 1.0
-        
-        # Normalize
-        s1 = s1.lower().strip()
-        s2 = s2.lower().strip()
-        
-        if s1 == s2:
-            return 1.0
-        
-        # Check if one contains the other
-        if s1 in s2:
-            return 0.9 * (len(s1) / len(s2))
-        if s2 in s1:
-            return 0.9 * (len(s2) / len(s1))
-        
-        # Word overlap (Jaccard similarity)
-        words1 = set(s1.split())
-        words2 = set(s2.split())
+    def get_show_episodes(self, rating_key: int) -> list[PlexEpisode]:
+        """Get all episodes for a show (cached until the next get_tv_shows)."""
+        cached = self._episodes_cache.get(rating_key)
+        if cached is not None:
+            return cached
         
-        if not words1 or not words2:
-            return 0.0
-        
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        jaccard = intersection / union
-        
-        # Also check character-level similarity (handles typos)
-        chars1 = set(s1.replace(' ', ''))
-        chars2 = set(s2.replace(' ', ''))
-        char_intersection = len(chars1 & chars2)
-        char_union = len(chars1 | chars2)
-        char_sim = char_intersection / char_union if char_union > 0 else 0
-        
-        # Weighted combination
-        return (jaccard * 0.7) + (char_sim * 0.3)
-
-    def get_show_episodes(self, rating_key: str) -> list[PlexEpisode]:
-        """Get all episodes for a show."""
         server = self._get_server()
         episodes = []
         
         try:
-            show = server.fetchItem(int(rating_key))
+            show = server.fetchItem(rating_key)
             
             for episode in show.episodes():
                 file_path = None
@@ -389,7 +510,7 @@ class PlexConnector:
                         file_path = first_media.parts[0].file
                 
                 episodes.append(PlexEpisode(
-                    rating_key=str(episode.ratingKey),
+                    rating_key=episode.ratingKey,
                     title=episode.title,
                     season_number=episode.seasonNumber,
                     episode_number=episode.episodeNumber,
@@ -397,7 +518,10 @@ class PlexConnector:
                 ))
         except Exception as e:
             logger.warning("Failed to get episodes for rating_key '%s': %s", rating_key, e)
+            # Leave failures uncached so the next file retries
+            return episodes
         
+        self._episodes_cache[rating_key] = episodes
         return episodes
 
     def match_file_to_episode(
@@ -410,30 +534,26 @@ class PlexConnector:
         
         Returns the matching episode if found.
         """
+        path_key = _PathKey.from_path(file_path)
+        
         # First find the show
-        show = self.find_show_by_path_or_title(file_path, show_title)
+        show = self.find_show_by_path_or_title(path_key, show_title)
         if not show:
             return None
         
         episodes = self.get_show_episodes(show.rating_key)
         
-        # Try exact path match
-        normalized_path = self._normalize_path(file_path)
-        for ep in episodes:
-            if ep.file_path:
-                if self._normalize_path(ep.file_path) == normalized_path:
-                    return ep
-        
-        # Try filename match
-        filename = os.path.basename(file_path).lower()
-        
+        # Try exact path match, remembering the first filename match as a fallback
+        filename_match = None
         for ep in episodes:
             if ep.file_path:
-                ep_filename = os.path.basename(ep.file_path).lower()
-                if ep_filename == filename:
+                ep_key = _PathKey.from_path(ep.file_path)
+                if ep_key.normalized == path_key.normalized:
                     return ep
+                if filename_match is None and ep_key.filename == path_key.filename:
+                    filename_match = ep
         
-        return None
+        return filename_match
 
     def sync_show_metadata(
         self,
@@ -447,13 +567,20 @@ class PlexConnector:
         
         Returns dict with show info and whether it's anime.
         """
-        plex_show = self.find_show_by_path_or_title(file_path, title_from_path)
+        plex_show = self.find_show_by_path_or_title(
+            _PathKey.from_path(file_path), title_from_path
+        )
         
         if not plex_show:
             return None
         
+        return self._show_metadata(plex_show)
+
+    def _show_metadata(self, plex_show: PlexShow) -> dict:
+        """Build the metadata dict returned by the sync methods."""
         return {
-            "plex_rating_key": plex_show.rating_key,
+            # Stored in a string column
+            "plex_rating_key": str(plex_show.rating_key),
             "title": plex_show.title,
             "original_title": plex_show.original_title,
             "year": plex_show.year,
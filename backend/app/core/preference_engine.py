@@ -1,10 +1,48 @@
 """Preference engine for evaluating audio track rules."""
 
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
+# Distinct (is_anime, language bits, default) layouts remembered per engine
+_ISSUE_CACHE_SIZE = 4096
 
-@dataclass
+# The only languages the rules check, as presence bits
+_LANG_EN = 1
+_LANG_JA = 2
+_LANG_BITS = {"en": _LANG_EN, "ja": _LANG_JA}
+
+# Dashboard issue categories, stored on media_files.issue_flags so the stats
+# query tests integer bits instead of substring-matching issue_details
+ISSUE_FLAG_MISSING_ENGLISH = 1
+ISSUE_FLAG_MISSING_JAPANESE = 2
+ISSUE_FLAG_MISSING_DUAL_AUDIO = 4
+
+_ISSUE_FLAGS_BY_MESSAGE = {
+    "Missing English audio track": ISSUE_FLAG_MISSING_ENGLISH,
+    "Missing Japanese audio track (anime)": ISSUE_FLAG_MISSING_JAPANESE,
+    "Missing English audio for dual audio (anime)": (
+        ISSUE_FLAG_MISSING_ENGLISH | ISSUE_FLAG_MISSING_DUAL_AUDIO
+    ),
+    "Missing Japanese audio for dual audio (anime)": (
+        ISSUE_FLAG_MISSING_JAPANESE | ISSUE_FLAG_MISSING_DUAL_AUDIO
+    ),
+    # Combined message evaluate_detailed emitted before it was split to match
+    # evaluate; the issue_details filters in app.api.media still match it
+    "Missing dual audio (English + Japanese) for anime": ISSUE_FLAG_MISSING_DUAL_AUDIO,
+}
+
+
+def issue_flags(messages: list[str]) -> int:
+    """Return the ISSUE_FLAG_* bits for a file's issue messages."""
+    flags = 0
+    for message in messages:
+        flags |= _ISSUE_FLAGS_BY_MESSAGE.get(message, 0)
+    return flags
+
+
+@dataclass(slots=True)
 class AudioPreferences:
     """Audio preference configuration."""
     
@@ -12,11 +50,17 @@ class AudioPreferences:
     require_japanese_anime: bool = True
     require_dual_audio_anime: bool = True
     check_default_track: bool = True
-    preferred_codecs: list[str] = field(default_factory=list)
+    preferred_codecs: frozenset[str] = field(default_factory=frozenset)
     auto_fix_english_default_non_anime: bool = False
 
+    def __post_init__(self):
+        # Accept any iterable; stored lowercased and interned for set checks
+        self.preferred_codecs = frozenset(
+            sys.intern(codec.lower()) for codec in self.preferred_codecs
+        )
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Issue:
     """Represents an issue found with a media file's audio tracks."""
     
@@ -25,6 +69,33 @@ class Issue:
     message: str
 
 
+@dataclass
+class _TrackAnalysis:
+    """Languages, default and codecs gathered in one pass over the tracks."""
+    
+    language_mask: int  # _LANG_* bits present
+    language_order: dict[str, None]  # as stored, first-seen order
+    default_language: Optional[str]  # lowercased
+    default_language_raw: Optional[str]  # as stored
+    codecs: set[str]  # lowercased
+    # Everything evaluate_detailed's rules look at, as a hashable key
+    fingerprint: tuple[int, Optional[str]]
+
+
+_NO_AUDIO_ISSUE = Issue(
+    severity="error",
+    code="NO_AUDIO",
+    message="No audio tracks found",
+)
+
+
+@lru_cache(maxsize=1024)
+def _lower_interned(value: str) -> str:
+    """Interned lowercase form of a track language or codec."""
+    # Keyed by the value, so callers' track dicts are never written to
+    return sys.intern(value.lower())
+
+
 class PreferenceEngine:
     """Engine for evaluating audio preferences against media files."""
 
@@ -37,6 +108,42 @@ class PreferenceEngine:
         """
         self.preferences = preferences or AudioPreferences()
 
+    @property
+    def preferences(self) -> AudioPreferences:
+        return self._preferences
+
+    @preferences.setter
+    def preferences(self, preferences: AudioPreferences) -> None:
+        # Memoized results and the check lists belong to the old preferences
+        self._preferences = preferences
+        self._issue_cache: dict[tuple, list[Issue]] = {}
+        # Read by the scanner once per file, so resolve it with the rules
+        self.auto_fix_enabled = bool(preferences.auto_fix_english_default_non_anime)
+        # Snapshot alongside the check tuples; AudioPreferences already
+        # normalizes, but a later plain-list assignment would not be
+        self._preferred_codecs_lc: frozenset[str] = frozenset(
+            sys.intern(codec.lower()) for codec in preferences.preferred_codecs
+        )
+        
+        # Only the enabled rules, in reporting order, so evaluation never
+        # re-tests preference flags
+        checks_non_anime = []
+        checks_anime = []
+        if preferences.require_english_non_anime:
+            checks_non_anime.append(self._check_english)
+        if preferences.require_japanese_anime:
+            checks_anime.append(self._check_japanese)
+        if preferences.require_dual_audio_anime:
+            checks_anime.append(self._check_dual_audio)
+        if preferences.check_default_track:
+            checks_non_anime.append(self._check_default)
+            checks_anime.append(self._check_default_anime)
+        if self._preferred_codecs_lc:
+            checks_non_anime.append(self._check_codecs)
+            checks_anime.append(self._check_codecs)
+        self._checks_non_anime = tuple(checks_non_anime)
+        self._checks_anime = tuple(checks_anime)
+
     def evaluate(
         self,
         audio_tracks: list[dict],
@@ -52,62 +159,7 @@ class PreferenceEngine:
         Returns:
             List of issue messages (empty if no issues)
         """
-        issues = []
-        
-        if not audio_tracks:
-            issues.append("No audio tracks found")
-            return issues
-        
-        # Get languages present
-        languages = set()
-        default_language = None
-        
-        for track in audio_tracks:
-            lang = track.get("language")
-            if lang:
-                languages.add(lang.lower())
-            if track.get("is_default"):
-                default_language = lang.lower() if lang else None
-        
-        # Check English requirement for non-anime
-        if not is_anime and self.preferences.require_english_non_anime:
-            if "en" not in languages:
-                issues.append("Missing English audio track")
-        
-        # Check Japanese requirement for anime
-        if is_anime and self.preferences.require_japanese_anime:
-            if "ja" not in languages:
-                issues.append("Missing Japanese audio track (anime)")
-        
-        # Check dual audio for anime
-        if is_anime and self.preferences.require_dual_audio_anime:
-            has_english = "en" in languages
-            has_japanese = "ja" in languages
-            if not (has_english and has_japanese):
-                if not has_english:
-                    issues.append("Missing English audio for dual audio (anime)")
-                if not has_japanese:
-                    issues.append("Missing Japanese audio for dual audio (anime)")
-        
-        # Check default track
-        if self.preferences.check_default_track and default_language:
-            if is_anime:
-                # For anime, default should be English or Japanese
-                if default_language not in ("en", "ja"):
-                    issues.append(f"Default audio track is '{default_language}', expected English or Japanese (anime)")
-            else:
-                # For non-anime, default should be English
-                if default_language != "en" and "en" in languages:
-                    issues.append(f"Default audio track is '{default_language}', expected English")
-        
-        # Check preferred codecs
-        if self.preferences.preferred_codecs:
-            codecs = {track.get("codec", "").lower() for track in audio_tracks if track.get("codec")}
-            preferred_lower = {c.lower() for c in self.preferences.preferred_codecs}
-            if codecs and not (codecs & preferred_lower):
-                issues.append(f"No preferred audio codec found (has: {', '.join(codecs)})")
-        
-        return issues
+        return [issue.message for issue in self.evaluate_detailed(audio_tracks, is_anime)]
 
     def evaluate_detailed(
         self,
@@ -124,75 +176,131 @@ class PreferenceEngine:
         Returns:
             List of Issue objects with severity and details
         """
-        issues = []
-        
         if not audio_tracks:
-            issues.append(Issue(
-                severity="error",
-                code="NO_AUDIO",
-                message="No audio tracks found",
-            ))
-            return issues
+            return [_NO_AUDIO_ISSUE]
         
-        # Get languages present
-        languages = set()
+        return self._evaluate_analysis(self._analyze(audio_tracks), is_anime)
+
+    def _analyze(self, audio_tracks: list[dict]) -> _TrackAnalysis:
+        """Collect languages, default language and codecs in a single pass."""
+        language_mask = 0
+        language_order = {}
         default_language = None
+        default_language_raw = None
+        default_seen = False
+        codecs = set()
         
         for track in audio_tracks:
             lang = track.get("language")
-            if lang:
-                languages.add(lang.lower())
-            if track.get("is_default"):
-                default_language = lang.lower() if lang else None
-        
-        # Check English requirement for non-anime
-        if not is_anime and self.preferences.require_english_non_anime:
-            if "en" not in languages:
-                issues.append(Issue(
-                    severity="error",
-                    code="MISSING_ENGLISH",
-                    message="Missing English audio track",
-                ))
-        
-        # Check Japanese requirement for anime
-        if is_anime and self.preferences.require_japanese_anime:
-            if "ja" not in languages:
-                issues.append(Issue(
-                    severity="error",
-                    code="MISSING_JAPANESE",
-                    message="Missing Japanese audio track (anime)",
-                ))
-        
-        # Check dual audio for anime
-        if is_anime and self.preferences.require_dual_audio_anime:
-            has_english = "en" in languages
-            has_japanese = "ja" in languages
-            if not (has_english and has_japanese):
-                issues.append(Issue(
-                    severity="warning",
-                    code="MISSING_DUAL_AUDIO",
-                    message="Missing dual audio (English + Japanese) for anime",
-                ))
-        
-        # Check default track
-        if self.preferences.check_default_track and default_language:
-            if is_anime:
-                if default_language not in ("en", "ja"):
-                    issues.append(Issue(
-                        severity="warning",
-                        code="WRONG_DEFAULT_ANIME",
-                        message=f"Default audio is '{default_language}', expected English or Japanese",
-                    ))
-            else:
-                if default_language != "en" and "en" in languages:
-                    issues.append(Issue(
-                        severity="warning",
-                        code="WRONG_DEFAULT",
-                        message=f"Default audio is '{default_language}', expected English",
-                    ))
+            lang_lower = _lower_interned(lang) if lang else None
+            if lang_lower:
+                language_mask |= _LANG_BITS.get(lang_lower, 0)
+                language_order[lang] = None
+            # Players honor the first default-flagged track; ignore later ones
+            if not default_seen and track.get("is_default"):
+                default_seen = True
+                default_language = lang_lower
+                default_language_raw = lang
+            codec = track.get("codec")
+            codec_lower = _lower_interned(codec) if codec else None
+            if codec_lower:
+                codecs.add(codec_lower)
         
+        return _TrackAnalysis(
+            language_mask=language_mask,
+            language_order=language_order,
+            default_language=default_language,
+            default_language_raw=default_language_raw,
+            codecs=codecs,
+            fingerprint=(language_mask, default_language),
+        )
+
+    def _evaluate_analysis(
+        self,
+        analysis: _TrackAnalysis,
+        is_anime: bool,
+    ) -> list[Issue]:
+        """Detailed issues for an analyzed track list, memoized by its fingerprint."""
+        codecs = analysis.codecs if self._preferred_codecs_lc else None
+        key = (is_anime, analysis.fingerprint, frozenset(codecs) if codecs else None)
+        cached = self._issue_cache.get(key)
+        if cached is None:
+            cached = self._build_issues(analysis, is_anime)
+            if len(self._issue_cache) >= _ISSUE_CACHE_SIZE:
+                del self._issue_cache[next(iter(self._issue_cache))]
+            self._issue_cache[key] = cached
+        return list(cached)
+
+    def _build_issues(
+        self,
+        analysis: _TrackAnalysis,
+        is_anime: bool,
+    ) -> list[Issue]:
+        """Build detailed issues from an already analyzed, non-empty track list."""
+        issues = []
+        for check in self._checks_anime if is_anime else self._checks_non_anime:
+            check(analysis, issues)
         return issues
 
+    def _check_english(self, analysis: _TrackAnalysis, issues: list[Issue]) -> None:
+        if not analysis.language_mask & _LANG_EN:
+            issues.append(Issue(
+                severity="error",
+                code="MISSING_ENGLISH",
+                message="Missing English audio track",
+            ))
+
+    def _check_japanese(self, analysis: _TrackAnalysis, issues: list[Issue]) -> None:
+        if not analysis.language_mask & _LANG_JA:
+            issues.append(Issue(
+                severity="error",
+                code="MISSING_JAPANESE",
+                message="Missing Japanese audio track (anime)",
+            ))
+
+    def _check_dual_audio(self, analysis: _TrackAnalysis, issues: list[Issue]) -> None:
+        if not analysis.language_mask & _LANG_EN:
+            issues.append(Issue(
+                severity="warning",
+                code="MISSING_DUAL_AUDIO",
+                message="Missing English audio for dual audio (anime)",
+            ))
+        if not analysis.language_mask & _LANG_JA:
+            issues.append(Issue(
+                severity="warning",
+                code="MISSING_DUAL_AUDIO",
+                message="Missing Japanese audio for dual audio (anime)",
+            ))
+
+    def _check_default_anime(self, analysis: _TrackAnalysis, issues: list[Issue]) -> None:
+        # For anime, default should be English or Japanese
+        default_language = analysis.default_language
+        if default_language and default_language not in ("en", "ja"):
+            issues.append(Issue(
+                severity="warning",
+                code="WRONG_DEFAULT_ANIME",
+                message=f"Default audio track is '{default_language}', expected English or Japanese (anime)",
+            ))
+
+    def _check_default(self, analysis: _TrackAnalysis, issues: list[Issue]) -> None:
+        # For non-anime, default should be English
+        default_language = analysis.default_language
+        if default_language and default_language != "en" and analysis.language_mask & _LANG_EN:
+            issues.append(Issue(
+                severity="warning",
+                code="WRONG_DEFAULT",
+                message=f"Default audio track is '{default_language}', expected English",
+            ))
+
+    def _check_codecs(self, analysis: _TrackAnalysis, issues: list[Issue]) -> None:
+        codecs = analysis.codecs
+        if codecs and not (codecs & self._preferred_codecs_lc):
+            issues.append(Issue(
+                severity="warning",
+                code="NO_PREFERRED_CODEC",
+                message=f"No preferred audio codec found (has: {', '.join(codecs)})",
+            ))
+
     def get_summary(
         self,
         audio_tracks: list[dict],
@@ -209,23 +317,30 @@ class PreferenceEngine:
             - languages: list of language codes
             - default_language: the default track's language
         """
-        issues = self.evaluate_detailed(audio_tracks, is_anime)
-        
-        languages = []
-        default_language = None
+        if not audio_tracks:
+            issues = [_NO_AUDIO_ISSUE]
+            languages = []
+            default_language = None
+        else:
+            analysis = self._analyze(audio_tracks)
+            issues = self._evaluate_analysis(analysis, is_anime)
+            # Only the summary needs the ordered list; evaluate never builds it
+            languages = list(analysis.language_order)
+            default_language = analysis.default_language_raw
         
-        for track in audio_tracks:
-            lang = track.get("language")
-            if lang and lang not in languages:
-                languages.append(lang)
-            if track.get("is_default"):
-                default_language = lang
+        error_count = 0
+        warning_count = 0
+        for issue in issues:
+            if issue.severity == "error":
+                error_count += 1
+            elif issue.severity == "warning":
+                warning_count += 1
         
         return {
             "has_issues": len(issues) > 0,
             "issue_count": len(issues),
-            "error_count": sum(1 for i in issues if i.severity == "error"),
-            "warning_count": sum(1 for i in issues if i.severity == "warning"),
+            "error_count": error_count,
+            "warning_count": warning_count,
             "languages": languages,
             "default_language": default_language,
         }
@@ -1,93 +1,128 @@
 """Centralized scan state management."""
 
 import asyncio
+import threading
 from datetime import datetime, timezone
 
 from app.models.schemas import ScanStatus
 
+# Transition locks are striped by user id; must be a power of two
+_LOCK_SHARDS = 16
+
 
 class ScanStateManager:
-    """Owns scan status and cancellation state for coordination across modules."""
+    """Owns scan status and cancellation state for coordination across modules.
+
+    Stored ScanStatus objects are never mutated; every transition swaps in a
+    new snapshot. Scan errors are kept in a private per-scan list and copied
+    into the snapshot handed out by the read methods, so a returned status
+    never changes after the fact.
+    """
 
     def __init__(self) -> None:
-        self._lock = asyncio.Lock()
+        # Striped locks guard multi-step transitions only. Every caller runs
+        # on the event loop and no critical section awaits, so a plain
+        # threading.Lock never blocks the loop. A fixed stripe set keeps the
+        # lock table from growing with every user ever seen; two users on
+        # one stripe only share a few dict writes. Reads are lock-free and
+        # see a complete snapshot because each transition publishes with a
+        # single assignment.
+        self._locks = tuple(threading.Lock() for _ in range(_LOCK_SHARDS))
         self._status_by_user: dict[int, ScanStatus] = {}
-        self._cancel_requested_by_user: dict[int, bool] = {}
+        self._cancel_events: dict[int, asyncio.Event] = {}
+        # Append-only error list per scan; only copies leave the manager
+        self._errors_by_user: dict[int, list[str]] = {}
+
+    def _lock_for(self, user_id: int) -> threading.Lock:
+        return self._locks[user_id & (_LOCK_SHARDS - 1)]
 
     def _get_or_create_status(self, user_id: int) -> ScanStatus:
         if user_id not in self._status_by_user:
             self._status_by_user[user_id] = ScanStatus(is_running=False)
         return self._status_by_user[user_id]
 
+    def _published(self, user_id: int, status: ScanStatus) -> ScanStatus:
+        """Return status with a copy of the scan's errors so far."""
+        errors = self._errors_by_user.get(user_id)
+        if not errors:
+            return status
+        # Copied per read rather than per append, so recording errors stays linear
+        return status.model_copy(update={"errors": list(errors)})
+
     async def get_status(self, user_id: int) -> ScanStatus:
-        """Return a safe copy of the current scan status."""
-        async with self._lock:
-            return self._get_or_create_status(user_id).model_copy(deep=True)
+        """Return the current scan status snapshot."""
+        return self._published(user_id, self._get_or_create_status(user_id))
 
     async def start_scan(self, user_id: int) -> ScanStatus | None:
         """Transition to running state, returning None if already running."""
-        async with self._lock:
+        # Built before taking the lock; only the check and publish happen under it
+        started = ScanStatus(
+            is_running=True,
+            current_location=None,
+            files_scanned=0,
+            files_total=0,
+            current_file=None,
+            started_at=datetime.now(timezone.utc),
+            errors=[],
+        )
+        with self._lock_for(user_id):
             status = self._get_or_create_status(user_id)
             if status.is_running:
                 return None
 
-            self._cancel_requested_by_user[user_id] = False
-            self._status_by_user[user_id] = ScanStatus(
-                is_running=True,
-                current_location=None,
-                files_scanned=0,
-                files_total=0,
-                current_file=None,
-                started_at=datetime.now(timezone.utc),
-                errors=[],
-            )
-            return self._status_by_user[user_id].model_copy(deep=True)
+            self._cancel_events[user_id] = asyncio.Event()
+            self._errors_by_user[user_id] = []
+            self._status_by_user[user_id] = started
+            return started
 
     async def cancel_scan(self, user_id: int) -> ScanStatus | None:
         """Request cancellation for a running scan."""
-        async with self._lock:
+        with self._lock_for(user_id):
             status = self._get_or_create_status(user_id)
             if not status.is_running:
                 return None
-            self._cancel_requested_by_user[user_id] = True
-            return status.model_copy(deep=True)
+            self._cancel_events.setdefault(user_id, asyncio.Event()).set()
+            return self._published(user_id, status)
 
-    async def is_cancel_requested(self, user_id: int) -> bool:
+    def is_cancel_requested(self, user_id: int) -> bool:
         """Check whether cancellation has been requested."""
-        async with self._lock:
-            return self._cancel_requested_by_user.get(user_id, False)
-
-    async def update_status(self, user_id: int, **kwargs) -> ScanStatus:
-        """Update scan status fields and return a copy of the new state."""
-        async with self._lock:
-            status = self._get_or_create_status(user_id)
-            current = status.model_dump()
-            current.update(kwargs)
-            self._status_by_user[user_id] = ScanStatus(**current)
-            return self._status_by_user[user_id].model_copy(deep=True)
-
-    async def append_error(self, user_id: int, error: str) -> ScanStatus:
-        """Append an error message to scan status."""
-        async with self._lock:
-            status = self._get_or_create_status(user_id)
-            status.errors.append(error)
-            return status.model_copy(deep=True)
+        event = self._cancel_events.get(user_id)
+        return event is not None and event.is_set()
+
+    async def update_status(self, user_id: int, **kwargs) -> None:
+        """Update scan status fields."""
+        # model_copy skips validation, so at least reject misspelled fields
+        unknown = kwargs.keys() - ScanStatus.model_fields.keys()
+        if unknown:
+            raise TypeError(f"Unknown scan status fields: {', '.join(sorted(unknown))}")
+        with self._lock_for(user_id):
+            if "errors" in kwargs:
+                # Errors live in the private list; snapshots only get copies
+                self._errors_by_user[user_id] = list(kwargs.pop("errors"))
+            status = self._get_or_create_status(user_id).model_copy(update=kwargs)
+            self._status_by_user[user_id] = status
+
+    async def append_error(self, user_id: int, error: str) -> None:
+        """Record an error message for the current scan."""
+        self._errors_by_user.setdefault(user_id, []).append(error)
 
     async def finish_scan(self, user_id: int) -> ScanStatus:
         """Transition to not running while keeping progress context."""
-        async with self._lock:
-            status = self._get_or_create_status(user_id)
-            self._cancel_requested_by_user[user_id] = False
-            status.is_running = False
-            status.current_location = None
-            status.current_file = None
-            return status.model_copy(deep=True)
+        with self._lock_for(user_id):
+            status = self._get_or_create_status(user_id).model_copy(
+                update={"is_running": False, "current_location": None, "current_file": None}
+            )
+            self._status_by_user[user_id] = status
+            event = self._cancel_events.get(user_id)
+            if event is not None:
+                event.clear()
+        return self._published(user_id, status)
 
-    async def reset(self) -> None:
+    def reset(self) -> None:
         """Reset state for tests."""
-        async with self._lock:
-            self._cancel_requested_by_user = {}
-            self._status_by_user = {}
+        self._cancel_events = {}
+        self._errors_by_user = {}
+        self._status_by_user = {}
 
 
 scan_state_manager = ScanStateManager()
@@ -1,29 +1,57 @@
 """Media file scanner for discovering and processing media files."""
 
+import asyncio
 import logging
 import os
 import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import bindparam, delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.database import async_session_maker
-from app.models.entities import MediaFile, Show, Season, ScanLocation, UserPreference
+from app.models.database import scan_session_maker
+from app.models.entities import AudioTrack, MediaFile, Show, Season, ScanLocation, UserPreference
 from app.core.analyzer import AudioAnalyzer
 from app.core.plex_connector import PlexConnector
-from app.core.preference_engine import PreferenceEngine, AudioPreferences
-from app.core.audio_fixer import set_default_track_by_index
+from app.core.preference_engine import PreferenceEngine, AudioPreferences, issue_flags
+from app.core.audio_fixer import find_track_index_for_language, set_default_track_by_index
 from app.models.schemas import AudioPreferences as AudioPreferencesSchema
 from app.core.scan_state import scan_state_manager
 
+try:
+    # Linear-time matching for the path patterns when google-re2 is installed
+    import re2 as _path_re
+except ImportError:
+    _path_re = re
+
 logger = logging.getLogger(__name__)
 
 # Default supported extensions
 DEFAULT_EXTENSIONS = {".mkv", ".mp4", ".avi", ".m4v", ".mov", ".wmv"}
 
+# Concurrent directory listings during discovery
+DISCOVERY_WORKERS = 32
+
+# Bound on IN (...) list sizes, well under SQLite's bound-variable limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Audio analysis runs this many files ahead of the DB loop in run_scan
+ANALYZE_PREFETCH = 16
+ANALYZE_WORKERS = os.cpu_count() or 4
+
+# run_scan commits after this many files, or sooner once this much time has
+# passed, so fsyncs are amortized without holding the write lock for long
+COMMIT_EVERY = 500
+COMMIT_INTERVAL_S = 0.25
+
 # Regex patterns for parsing show/season/episode from file paths
 SHOW_PATTERNS = [
     # Show Name/Season 01/E01 - Title.mkv
@@ -41,6 +69,62 @@ SHOW_PATTERNS = [
     ),
 ]
 
+# SHOW_PATTERNS as one anchored alternation: the alternatives are tried in
+# list order at position 0, so the first pattern that matches still wins
+_SHOW_PATTERN_COMBINED = _path_re.compile(
+    "(?i)^(?:"
+    + "|".join(
+        f"(?:{pattern.pattern[1:]})".replace("(?P<show>", f"(?P<show{i}>")
+        .replace("(?P<season>", f"(?P<season{i}>")
+        .replace("(?P<episode>", f"(?P<episode{i}>")
+        for i, pattern in enumerate(SHOW_PATTERNS)
+    )
+    + ")"
+)
+_SHOW_PATTERN_GROUPS = [
+    (f"show{i}", f"season{i}", f"episode{i}") for i in range(len(SHOW_PATTERNS))
+]
+
+# The directory half of the first SHOW_PATTERNS entry, plus its episode search
+_SEASON_DIR_PATTERN = _path_re.compile(
+    r"(?i)^(?P<show>.+?)[/\\]Season\s*(?P<season>\d+)(?P<rest>(?:[/\\].*)?)$"
+)
+_EPISODE_PATTERN = _path_re.compile(r"[Ee](?P<episode>\d+)")
+
+PARSE_CACHE_SIZE = 4096
+
+
+def _clean_title(raw: str) -> str:
+    """Normalize a path-derived title; interned, as every file of a show repeats it."""
+    return sys.intern(raw.strip().replace(".", " "))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_dir_info(dir_relative: str) -> Optional[tuple[str, int, str]]:
+    """Parse show and season from a "Show/Season NN" directory, plus the path after it."""
+    match = _SEASON_DIR_PATTERN.match(dir_relative)
+    if not match:
+        return None
+    return (
+        _clean_title(match.group("show")),
+        int(match.group("season")),
+        match.group("rest"),
+    )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_movie_dir(dir_relative: str) -> Optional[str]:
+    """Movie title from the top-level folder of a file's directory, if nested."""
+    if dir_relative == os.curdir:
+        return None
+    return _clean_title(Path(dir_relative).parts[0])
+
+
+def clear_parse_caches() -> None:
+    """Drop memoized directory parses, e.g. before a new scan."""
+    _parse_dir_info.cache_clear()
+    _parse_movie_dir.cache_clear()
+
 
 def parse_show_info(file_path: str, base_path: str) -> dict:
     """
@@ -48,32 +132,33 @@ def parse_show_info(file_path: str, base_path: str) -> dict:
 
     Returns a dict with keys: show, season, episode (all optional)
     """
+    directory, filename = os.path.split(file_path)
+    dir_info = _parse_dir_info(os.path.relpath(directory, base_path))
+    if dir_info is not None:
+        show, season, rest = dir_info
+        episode = _EPISODE_PATTERN.search(rest + os.sep + filename)
+        if episode:
+            return {"show": show, "season": season, "episode": int(episode.group("episode"))}
+
     # Get relative path from base
     relative_path = os.path.relpath(file_path, base_path)
 
-    for pattern in SHOW_PATTERNS:
-        match = pattern.search(relative_path)
-        if match:
-            groups = match.groupdict()
-            try:
-                season_num = int(groups.get("season", 0))
-            except (ValueError, TypeError):
-                season_num = 0
-            try:
-                episode_num = int(groups.get("episode", 0))
-            except (ValueError, TypeError):
-                episode_num = 0
-            return {
-                "show": groups.get("show", "").strip().replace(".", " "),
-                "season": season_num,
-                "episode": episode_num,
-            }
+    match = _SHOW_PATTERN_COMBINED.match(relative_path)
+    if match:
+        for show_group, season_group, episode_group in _SHOW_PATTERN_GROUPS:
+            show = match.group(show_group)
+            if show is not None:
+                return {
+                    "show": _clean_title(show),
+                    "season": int(match.group(season_group)),
+                    "episode": int(match.group(episode_group)),
+                }
 
     # Fallback: use parent directory as show name
     parts = Path(relative_path).parts
     if len(parts) >= 2:
         return {
-            "show": parts[0].strip().replace(".", " "),
+            "show": _clean_title(parts[0]),
             "season": 1,
             "episode": None,
         }
@@ -88,15 +173,65 @@ def parse_movie_title(file_path: str, base_path: str) -> str:
     For movies, the parent folder name is typically the movie title,
     or the filename itself if it's directly in the base path.
     """
-    relative_path = os.path.relpath(file_path, base_path)
-    parts = Path(relative_path).parts
-
-    if len(parts) >= 2:
+    directory = os.path.dirname(file_path)
+    title = _parse_movie_dir(os.path.relpath(directory, base_path))
+    if title is not None:
         # Use the top-level folder as the movie title
-        return parts[0].strip().replace(".", " ")
+        return title
 
     # File is directly in the base path — use filename without extension
-    return Path(file_path).stem.strip().replace(".", " ")
+    return _clean_title(Path(file_path).stem)
+
+
+# Per-file lookups outside the preload, built once with bind parameters
+_MEDIA_FILE_STATE_BY_PATH = select(
+    MediaFile.id, MediaFile.file_mtime_ns, MediaFile.file_size, MediaFile.last_modified
+).where(
+    MediaFile.file_path == bindparam("file_path"),
+    MediaFile.user_id == bindparam("user_id"),
+)
+_SHOW_BY_RATING_KEY = select(Show).where(
+    Show.plex_rating_key == bindparam("plex_rating_key"),
+    Show.user_id == bindparam("user_id"),
+)
+_SHOW_BY_TITLE = select(Show).where(
+    Show.title == bindparam("title"),
+    Show.user_id == bindparam("user_id"),
+)
+_SEASON_BY_NUMBER = select(Season).where(
+    Season.show_id == bindparam("show_id"),
+    Season.season_number == bindparam("season_number"),
+)
+
+
+@dataclass
+class _ScanPreload:
+    """Rows bulk-loaded for one user's scan, keyed the way process_file looks them up."""
+
+    user_id: int
+    session: AsyncSession
+    file_paths: set[str]
+    # file_path -> (file_mtime_ns, file_size, last_modified) for every stored file
+    manifest: dict[str, tuple[Optional[int], int, datetime]] = field(default_factory=dict)
+    media_files: dict[str, MediaFile] = field(default_factory=dict)
+    shows_by_rating_key: dict[str, Show] = field(default_factory=dict)
+    shows_by_title: dict[str, Show] = field(default_factory=dict)
+    seasons: dict[tuple[int, int], Season] = field(default_factory=dict)
+
+    def add_show(self, show: Show) -> None:
+        if show.plex_rating_key:
+            self.shows_by_rating_key.setdefault(show.plex_rating_key, show)
+        self.shows_by_title.setdefault(show.title, show)
+
+
+def _is_unchanged(
+    file_mtime_ns: Optional[int], file_size: int, last_modified: datetime, stat: os.stat_result
+) -> bool:
+    """Whether a stored file still matches its stat, so the scan can skip it."""
+    if file_mtime_ns is not None:
+        return file_mtime_ns == stat.st_mtime_ns and file_size == stat.st_size
+    # Rows from before file_mtime_ns was recorded
+    return last_modified >= datetime.fromtimestamp(stat.st_mtime)
 
 
 class MediaScanner:
@@ -112,39 +247,162 @@ class MediaScanner:
         self.analyzer = AudioAnalyzer()
         self.plex_connector = PlexConnector(plex_token) if plex_token else None
         self.preference_engine = PreferenceEngine(audio_preferences)
+        self._preload: Optional[_ScanPreload] = None
+        # Stats captured during discovery, consumed once by process_file
+        self._discovered_stats: dict[str, os.stat_result] = {}
+
+    async def preload(self, db: AsyncSession, user_id: int, file_paths: list[str]) -> None:
+        """
+        Bulk-load the rows process_file needs for these files.
+
+        Replaces the per-file SELECTs for media files, shows and seasons
+        with a handful of queries; lookups outside the preload still query.
+        Full media file rows are only loaded for files whose discovery stat
+        no longer matches the stored manifest entry.
+        """
+        preload = _ScanPreload(user_id=user_id, session=db, file_paths=set(file_paths))
+
+        result = await db.execute(
+            select(
+                MediaFile.file_path,
+                MediaFile.file_mtime_ns,
+                MediaFile.file_size,
+                MediaFile.last_modified,
+            ).where(MediaFile.user_id == user_id)
+        )
+        for file_path, file_mtime_ns, file_size, last_modified in result:
+            preload.manifest[file_path] = (file_mtime_ns, file_size, last_modified)
+
+        changed = []
+        for file_path in file_paths:
+            entry = preload.manifest.get(file_path)
+            if entry is None:
+                continue
+            stat = self._discovered_stats.get(file_path)
+            if stat is None or not _is_unchanged(*entry, stat):
+                changed.append(file_path)
+
+        for start in range(0, len(changed), IN_CLAUSE_CHUNK_SIZE):
+            chunk = changed[start:start + IN_CLAUSE_CHUNK_SIZE]
+            result = await db.execute(
+                select(MediaFile).where(
+                    MediaFile.user_id == user_id,
+                    MediaFile.file_path.in_(chunk),
+                )
+            )
+            for media_file in result.scalars():
+                preload.media_files[media_file.file_path] = media_file
+
+        # Final show titles depend on Plex matching, so load all of the user's shows
+        result = await db.execute(select(Show).where(Show.user_id == user_id))
+        for show in result.scalars():
+            preload.add_show(show)
+
+        result = await db.execute(
+            select(Season).join(Show, Season.show_id == Show.id).where(Show.user_id == user_id)
+        )
+        for season in result.scalars():
+            preload.seasons.setdefault((season.show_id, season.season_number), season)
+
+        self._preload = preload
+
+    def _preloaded(
+        self, user_id: int, db: Optional[AsyncSession] = None
+    ) -> Optional[_ScanPreload]:
+        """The preload for this user; with db, only if its rows belong to that session."""
+        preload = self._preload
+        if (
+            preload is not None
+            and preload.user_id == user_id
+            and (db is None or preload.session is db)
+        ):
+            return preload
+        return None
+
+    async def _get_existing_file(
+        self, db: AsyncSession, user_id: int, file_path: str, stat: os.stat_result
+    ) -> tuple[bool, Optional[MediaFile]]:
+        """
+        Return (unchanged, existing row) for a file.
+
+        Outside the preload, unchanged files are recognized from a few
+        columns; the ORM row is only loaded when it is going to be updated.
+        """
+        preload = self._preloaded(user_id, db)
+        if preload is not None and file_path in preload.file_paths:
+            # process_file already checked the manifest
+            return False, preload.media_files.get(file_path)
+        result = await db.execute(
+            _MEDIA_FILE_STATE_BY_PATH, {"file_path": file_path, "user_id": user_id}
+        )
+        row = result.first()
+        if row is None:
+            return False, None
+        if _is_unchanged(row.file_mtime_ns, row.file_size, row.last_modified, stat):
+            return True, None
+        return False, await db.get(MediaFile, row.id)
+
+    async def _get_show_by_rating_key(
+        self, db: AsyncSession, user_id: int, plex_rating_key: str
+    ) -> Optional[Show]:
+        preload = self._preloaded(user_id, db)
+        if preload is not None:
+            return preload.shows_by_rating_key.get(plex_rating_key)
+        result = await db.execute(
+            _SHOW_BY_RATING_KEY, {"plex_rating_key": plex_rating_key, "user_id": user_id}
+        )
+        return result.scalar_one_or_none()
+
+    async def _get_show_by_title(
+        self, db: AsyncSession, user_id: int, title: str
+    ) -> Optional[Show]:
+        preload = self._preloaded(user_id, db)
+        if preload is not None:
+            return preload.shows_by_title.get(title)
+        result = await db.execute(_SHOW_BY_TITLE, {"title": title, "user_id": user_id})
+        return result.scalar_one_or_none()
+
+    async def _get_season(
+        self, db: AsyncSession, user_id: int, show_id: int, season_number: int
+    ) -> Optional[Season]:
+        preload = self._preloaded(user_id, db)
+        if preload is not None:
+            return preload.seasons.get((show_id, season_number))
+        result = await db.execute(
+            _SEASON_BY_NUMBER, {"show_id": show_id, "season_number": season_number}
+        )
+        return result.scalar_one_or_none()
 
     def _get_english_default_fix_index(self, audio_tracks: list[dict]) -> Optional[int]:
         """Return the English track index to promote as default, if needed."""
-        default_track = None
-        english_indices: list[int] = []
-
-        for track in audio_tracks:
-            language = (track.get("language") or "").lower()
-            track_index = track.get("index")
-            if language == "en" and isinstance(track_index, int):
-                english_indices.append(track_index)
-            if track.get("is_default"):
-                default_track = track
-
-        if not english_indices:
+        english_index = find_track_index_for_language(audio_tracks, "en")
+        if english_index is None:
             return None
 
+        default_track = next((track for track in audio_tracks if track.get("is_default")), None)
         default_language = (default_track.get("language") or "").lower() if default_track else None
         if default_language == "en":
             return None
 
-        return english_indices[0]
+        return english_index
 
     def _auto_fix_default_track(self, file_path: str, audio_info: dict, is_anime: bool) -> dict:
         """Try to set the English track as default for non-anime files when enabled."""
-        if not self.preference_engine.preferences.auto_fix_english_default_non_anime:
+        if is_anime or not self.preference_engine.auto_fix_enabled:
             return audio_info
 
         audio_tracks = audio_info.get("audio_tracks", [])
-        if is_anime or not audio_tracks:
+        if not audio_tracks:
             return audio_info
 
-        english_index = self._get_english_default_fix_index(audio_tracks)
+        if "english_track_index" in audio_info:
+            # Recorded by the analyzer while parsing, so no second pass here
+            english_index = audio_info["english_track_index"]
+            default_index = audio_info["default_track_index"]
+            if default_index is not None and audio_tracks[default_index].get("language") == "en":
+                english_index = None
+        else:
+            english_index = self._get_english_default_fix_index(audio_tracks)
         if english_index is None:
             return audio_info
 
@@ -155,21 +413,75 @@ class MediaScanner:
         logger.warning("Auto-fix skipped or failed for file: %s", file_path)
         return audio_info
 
-    def discover_files(self, location: str) -> list[str]:
-        """Discover all media files in a location."""
-        files = []
-        location_path = Path(location)
+    def prefetch_analysis(self, file_path: str, user_id: int) -> Optional[dict]:
+        """
+        Analyze a file ahead of process_file, from a worker thread.
 
-        if not location_path.exists():
-            raise ValueError(f"Location does not exist: {location}")
+        Returns None for files the manifest says are unchanged, or that
+        cannot be statted; process_file then handles them itself.
+        """
+        try:
+            stat = self._discovered_stats.get(file_path) or os.stat(file_path)
+        except OSError:
+            return None
+        preload = self._preloaded(user_id)
+        entry = preload.manifest.get(file_path) if preload is not None else None
+        if entry is not None and _is_unchanged(*entry, stat):
+            return None
+        return self.analyzer.analyze(file_path)
 
-        for root, _, filenames in os.walk(location_path):
-            for filename in filenames:
-                ext = Path(filename).suffix.lower()
-                if ext in self.extensions:
-                    files.append(os.path.join(root, filename))
+    def discover_files(self, location: str, threads: int = DISCOVERY_WORKERS) -> list[str]:
+        """Discover all media files in a location."""
+        if not os.path.exists(location):
+            raise ValueError(f"Location does not exist: {location}")
 
-        return sorted(files)
+        files = []
+        # Subtrees are listed concurrently so readdir latency on network
+        # shares overlaps; results are merged here on the calling thread
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            pending = {pool.submit(self._scan_directory, os.fspath(location))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    subdirs, found = future.result()
+                    for path, stat in found:
+                        files.append(path)
+                        if stat is not None:
+                            self._discovered_stats[path] = stat
+                    pending.update(pool.submit(self._scan_directory, d) for d in subdirs)
+
+        files.sort()
+        return files
+
+    def _scan_directory(
+        self, directory: str
+    ) -> tuple[list[str], list[tuple[str, Optional[os.stat_result]]]]:
+        """List one directory: its subdirectories and matching media files with stats."""
+        subdirs = []
+        found = []
+        extensions = self.extensions
+        try:
+            # dirent types avoid a stat per entry; directory symlinks are not
+            # followed, as with os.walk
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                        continue
+                    name = entry.name
+                    dot = name.rfind(".")
+                    if dot == -1 or name[dot:].lower() not in extensions:
+                        continue
+                    if entry.is_file():
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            stat = None  # process_file will stat it again
+                        found.append((entry.path, stat))
+        except OSError as e:
+            # Unreadable subdirectories are skipped, as os.walk did
+            logger.warning("Skipping unreadable path during discovery: %s", e)
+        return subdirs, found
 
     async def process_file(
         self,
@@ -178,31 +490,38 @@ class MediaScanner:
         media_type: str,
         user_id: int,
         db: AsyncSession,
+        audio_info: Optional[dict] = None,
+        now: Optional[datetime] = None,
     ) -> Optional[MediaFile]:
-        """Process a single media file."""
+        """Process a single media file; returns None if it was unchanged or failed."""
         try:
             is_movie = media_type == "movie"
             is_anime = media_type == "anime"
 
-            # Check if file already exists in database
-            result = await db.execute(
-                select(MediaFile).where(
-                    MediaFile.file_path == file_path,
-                    MediaFile.user_id == user_id,
-                )
-            )
-            existing = result.scalar_one_or_none()
-
-            # Get file stats
-            stat = os.stat(file_path)
-            file_mtime = datetime.fromtimestamp(stat.st_mtime)
+            # Get file stats, reusing the one taken during discovery
+            stat = self._discovered_stats.pop(file_path, None) or os.stat(file_path)
 
-            # Skip if file hasn't changed (incremental scan)
-            if existing and existing.last_modified >= file_mtime:
-                return existing
+            # Skip if file hasn't changed (incremental scan), without touching the DB
+            preload = self._preloaded(user_id)
+            if preload is not None:
+                entry = preload.manifest.get(file_path)
+                if entry is not None and _is_unchanged(*entry, stat):
+                    return None
+            # Preloaded ORM rows are only reused within the session that loaded them
+            preload = self._preloaded(user_id, db)
 
-            # Analyze audio tracks
-            audio_info = self.analyzer.analyze(file_path)
+            # Check if file already exists in database
+            unchanged, existing = await self._get_existing_file(db, user_id, file_path, stat)
+            if unchanged:
+                return None
+            # One timestamp per commit batch, so rows written together share it
+            # instead of each ORM default calling the clock
+            now = now or datetime.now(timezone.utc)
+
+            # Analyze audio tracks, unless run_scan already did; off the event
+            # loop so other requests and the DB work are not stalled
+            if audio_info is None:
+                audio_info = await asyncio.to_thread(self.analyzer.analyze, file_path)
 
             # Determine title and metadata based on media type
             if is_movie:
@@ -235,36 +554,29 @@ class MediaScanner:
                 plex_rating_key = None
                 thumb_url = None
 
-            # Automatically fix default audio for non-anime content when possible
-            audio_info = self._auto_fix_default_track(
-                file_path=file_path,
-                audio_info=audio_info,
-                is_anime=is_anime,
-            )
+            # Automatically fix default audio for non-anime content when possible;
+            # the fix runs mkvpropedit and re-analyzes, so it goes to a thread
+            if self.preference_engine.auto_fix_enabled and not is_anime:
+                audio_info = await asyncio.to_thread(
+                    self._auto_fix_default_track,
+                    file_path=file_path,
+                    audio_info=audio_info,
+                    is_anime=is_anime,
+                )
 
             # Find or create show
             show = None
             season = None
+            new_season = None
 
             if show_title:
                 # First try to find by Plex rating key
                 if plex_rating_key:
-                    result = await db.execute(
-                        select(Show).where(
-                            Show.plex_rating_key == plex_rating_key,
-                            Show.user_id == user_id,
-                        )
-                    )
-                    show = result.scalar_one_or_none()
+                    show = await self._get_show_by_rating_key(db, user_id, plex_rating_key)
 
                 # Then try by title
                 if not show:
-                    result = await db.execute(
-                        select(Show).where(
-                            Show.title == show_title, Show.user_id == user_id
-                        )
-                    )
-                    show = result.scalar_one_or_none()
+                    show = await self._get_show_by_title(db, user_id, show_title)
 
                 # Check path-based title (handles English folder names)
                 if (
@@ -272,15 +584,14 @@ class MediaScanner:
                     and show_info.get("show")
                     and show_info["show"] != show_title
                 ):
-                    result = await db.execute(
-                        select(Show).where(
-                            Show.title == show_info["show"], Show.user_id == user_id
-                        )
+                    existing_show = await self._get_show_by_title(
+                        db, user_id, show_info["show"]
                     )
-                    existing_show = result.scalar_one_or_none()
                     if existing_show:
                         show = existing_show
                         if plex_metadata:
+                            if preload is not None:
+                                preload.shows_by_title.pop(show.title, None)
                             show.title = show_title
                             show.plex_rating_key = plex_rating_key
                             show.is_anime = is_anime
@@ -296,9 +607,10 @@ class MediaScanner:
                         is_anime=is_anime,
                         anime_source=anime_source,
                         thumb_url=thumb_url,
+                        created_at=now,
+                        updated_at=now,
                     )
                     db.add(show)
-                    await db.flush()
                 elif plex_metadata and not show.plex_rating_key:
                     show.plex_rating_key = plex_rating_key
                     show.is_anime = is_anime
@@ -306,30 +618,28 @@ class MediaScanner:
                     if thumb_url:
                         show.thumb_url = thumb_url
 
-                # Find or create season (TV/anime only)
+                if preload is not None:
+                    # Keep lookups current for later files (new shows, renames, keys)
+                    preload.add_show(show)
+
+                # Find or create season (TV/anime only); a show that is not
+                # flushed yet has no seasons to look up
                 if not is_movie and show_info.get("season"):
-                    result = await db.execute(
-                        select(Season).where(
-                            Season.show_id == show.id,
-                            Season.season_number == show_info["season"],
+                    if show.id is not None:
+                        season = await self._get_season(
+                            db, user_id, show.id, show_info["season"]
                         )
-                    )
-                    season = result.scalar_one_or_none()
 
                     if not season:
-                        season = Season(
-                            show_id=show.id,
+                        season = new_season = Season(
+                            show=show,
                             season_number=show_info["season"],
                         )
                         db.add(season)
-                        await db.flush()
 
             # Create or update media file
             if existing:
                 media_file = existing
-                from app.models.entities import AudioTrack
-                from sqlalchemy import delete
-
                 await db.execute(
                     delete(AudioTrack).where(AudioTrack.media_file_id == media_file.id)
                 )
@@ -337,43 +647,23 @@ class MediaScanner:
                 media_file = MediaFile(user_id=user_id, file_path=file_path)
                 db.add(media_file)
 
-            # Update media file info
+            # Update media file info; the relationships let the single flush
+            # below insert new shows and seasons first and fill in the keys
             media_file.filename = os.path.basename(file_path)
-            media_file.show_id = show.id if show else None
-            media_file.season_id = season.id if season else None
+            media_file.show = show
+            media_file.season = season
             media_file.episode_number = (
                 show_info.get("episode") if not is_movie else None
             )
             media_file.file_size = stat.st_size
             media_file.container_format = audio_info.get("container")
             media_file.duration_ms = audio_info.get("duration_ms")
-            media_file.last_scanned = datetime.now(timezone.utc)
-            media_file.last_modified = file_mtime
-
-            await db.flush()
-
-            # Add audio tracks
-            from app.models.entities import AudioTrack
-
-            for track_info in audio_info.get("audio_tracks", []):
-                track = AudioTrack(
-                    media_file_id=media_file.id,
-                    track_index=track_info.get("index", 0),
-                    language=track_info.get("language"),
-                    language_raw=track_info.get("language_raw"),
-                    codec=track_info.get("codec"),
-                    channels=track_info.get("channels"),
-                    channel_layout=track_info.get("channel_layout"),
-                    bitrate=track_info.get("bitrate"),
-                    is_default=track_info.get("is_default", False),
-                    is_forced=track_info.get("is_forced", False),
-                    title=track_info.get("title"),
-                )
-                db.add(track)
+            media_file.last_scanned = now
+            media_file.last_modified = datetime.fromtimestamp(stat.st_mtime)
+            media_file.file_mtime_ns = stat.st_mtime_ns
 
-            await db.flush()
-
-            # Evaluate preferences and set issues
+            # Evaluate preferences before the flush, so the issue columns go
+            # out with the INSERT/UPDATE instead of a second UPDATE per file
             final_is_anime = show.is_anime if show else is_anime
             issues = self.preference_engine.evaluate(
                 audio_info.get("audio_tracks", []),
@@ -382,6 +672,32 @@ class MediaScanner:
 
             media_file.has_issues = len(issues) > 0
             media_file.issue_details = "; ".join(issues) if issues else None
+            media_file.issue_flags = issue_flags(issues)
+
+            await db.flush()
+
+            if new_season is not None and preload is not None:
+                preload.seasons[(show.id, new_season.season_number)] = new_season
+
+            # Add audio tracks with one executemany INSERT
+            rows = [
+                {
+                    "media_file_id": media_file.id,
+                    "track_index": track_info.get("index", 0),
+                    "language": track_info.get("language"),
+                    "language_raw": track_info.get("language_raw"),
+                    "codec": track_info.get("codec"),
+                    "channels": track_info.get("channels"),
+                    "channel_layout": track_info.get("channel_layout"),
+                    "bitrate": track_info.get("bitrate"),
+                    "is_default": track_info.get("is_default", False),
+                    "is_forced": track_info.get("is_forced", False),
+                    "title": track_info.get("title"),
+                }
+                for track_info in audio_info.get("audio_tracks", [])
+            ]
+            if rows:
+                await db.execute(insert(AudioTrack), rows)
 
             return media_file
 
@@ -436,6 +752,7 @@ async def run_scan(
         errors=[],
     )
 
+    clear_parse_caches()
     scanner = MediaScanner(plex_token=user_plex_token)
 
     try:
@@ -456,30 +773,85 @@ async def run_scan(
         await scan_state_manager.update_status(user_id, files_total=len(all_files))
 
         # Process files
-        async with async_session_maker() as db:
-            audio_preferences = await _load_user_audio_preferences(db, user_id)
-            scanner = MediaScanner(
-                plex_token=user_plex_token,
-                audio_preferences=audio_preferences,
+        async with scan_session_maker() as db:
+            # Load the Plex library in a worker thread while the DB preload
+            # runs; per-file lookups are then served from its caches
+            plex_warmup = None
+            if scanner.plex_connector:
+                plex_warmup = asyncio.create_task(
+                    asyncio.to_thread(scanner.plex_connector.get_tv_shows)
+                )
+
+            # Keep the discovery scanner so its captured stats are reused
+            scanner.preference_engine.preferences = await _load_user_audio_preferences(
+                db, user_id
             )
 
-            for i, (file_path, base_path, media_type) in enumerate(all_files):
-                if await scan_state_manager.is_cancel_requested(user_id):
-                    break
+            await scanner.preload(db, user_id, [file_path for file_path, _, _ in all_files])
+
+            if plex_warmup is not None:
+                try:
+                    await plex_warmup
+                except Exception as e:
+                    # process_file retries the lookup and reports per-file errors
+                    logger.warning("Failed to load Plex library before scan: %s", e)
+
+            # mediainfo parsing runs in worker threads, ANALYZE_PREFETCH files
+            # ahead, so it overlaps with the DB work for the current file
+            pool = ThreadPoolExecutor(max_workers=ANALYZE_WORKERS)
+            analyses: deque[Future] = deque(
+                pool.submit(scanner.prefetch_analysis, file_path, user_id)
+                for file_path, _, _ in all_files[:ANALYZE_PREFETCH]
+            )
+            last_commit = time.monotonic()
+            # One scan timestamp per commit batch rather than per file
+            now = datetime.now(timezone.utc)
+            try:
+                for i, (file_path, base_path, media_type) in enumerate(all_files):
+                    if scan_state_manager.is_cancel_requested(user_id):
+                        break
+
+                    if i + ANALYZE_PREFETCH < len(all_files):
+                        analyses.append(
+                            pool.submit(
+                                scanner.prefetch_analysis,
+                                all_files[i + ANALYZE_PREFETCH][0],
+                                user_id,
+                            )
+                        )
 
-                await scan_state_manager.update_status(
-                    user_id,
-                    files_scanned=i + 1,
-                    current_file=os.path.basename(file_path),
-                )
+                    await scan_state_manager.update_status(
+                        user_id,
+                        files_scanned=i + 1,
+                        current_file=os.path.basename(file_path),
+                    )
 
-                await scanner.process_file(
-                    file_path, base_path, media_type, user_id, db
-                )
+                    try:
+                        audio_info = await asyncio.wrap_future(analyses.popleft())
+                    except Exception as e:
+                        logger.warning("Prefetched analysis failed for %s: %s", file_path, e)
+                        audio_info = None
+
+                    await scanner.process_file(
+                        file_path,
+                        base_path,
+                        media_type,
+                        user_id,
+                        db,
+                        audio_info=audio_info,
+                        now=now,
+                    )
 
-                # Commit periodically
-                if (i + 1) % 50 == 0:
-                    await db.commit()
+                    # Commit periodically
+                    if (
+                        (i + 1) % COMMIT_EVERY == 0
+                        or time.monotonic() - last_commit > COMMIT_INTERVAL_S
+                    ):
+                        await db.commit()
+                        last_commit = time.monotonic()
+                        now = datetime.now(timezone.utc)
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
 
             await db.commit()
 
@@ -497,7 +869,9 @@ async def run_scan(
                     file_count = (
                         await db.scalar(
                             select(func.count(MediaFile.id)).where(
-                                MediaFile.file_path.like(f"{location}%"),
+                                # A string range only matches prefixes under byte-order
+                                # collation, which PostgreSQL locales don't guarantee
+                                MediaFile.file_path.startswith(location, autoescape=True),
                                 MediaFile.user_id == user_id,
                             )
                         )
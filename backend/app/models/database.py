@@ -4,6 +4,7 @@ from collections.abc import AsyncGenerator
 from pathlib import Path
 
 from sqlalchemy import event
+from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.config import get_settings
@@ -35,14 +36,34 @@ engine = create_async_engine(
     connect_args=sqlite_connect_args,
 )
 
+# Separate engine for background scans, so their long write transactions
+# never hold connections from the pool that serves API requests
+scan_engine = create_async_engine(
+    settings.database_url,
+    echo=settings.debug,
+    connect_args={**sqlite_connect_args, "timeout": 60} if settings.is_sqlite else {},
+    poolclass=NullPool,
+)
+
 if settings.is_sqlite:
     # Reduce SQLITE_BUSY errors under concurrent read/write load.
     @event.listens_for(engine.sync_engine, "connect")
+    @event.listens_for(scan_engine.sync_engine, "connect")
     def set_sqlite_pragma(dbapi_connection, _connection_record) -> None:
         cursor = dbapi_connection.cursor()
+        # Only applies when the file is created; must precede the WAL switch.
+        cursor.execute("PRAGMA page_size = 8192")
         cursor.execute("PRAGMA busy_timeout = 30000")
         cursor.execute("PRAGMA journal_mode = WAL")
         cursor.execute("PRAGMA synchronous = NORMAL")
+        # Fewer, larger checkpoints and a 64 MiB page cache for scan writes.
+        cursor.execute("PRAGMA wal_autocheckpoint = 10000")
+        cursor.execute("PRAGMA cache_size = -65536")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.execute("PRAGMA mmap_size = 268435456")
+        # Off by default in SQLite; the ondelete="CASCADE" foreign keys do the
+        # child deletes the ORM relationships leave to the database.
+        cursor.execute("PRAGMA foreign_keys = ON")
         cursor.close()
 
 # Session factory
@@ -54,6 +75,15 @@ async_session_maker = async_sessionmaker(
     autoflush=False,
 )
 
+# Session factory for run_scan; API endpoints keep using async_session_maker
+scan_session_maker = async_sessionmaker(
+    scan_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """Dependency to get database session."""
@@ -72,6 +102,9 @@ async def init_db() -> None:
     """Initialize database tables."""
     from app.models.entities import Base
     from app.models.migrations import (
+        apply_issue_flags_migration,
+        apply_lookup_index_migration,
+        apply_media_file_mtime_migration,
         apply_ownership_migrations,
         apply_token_encryption_migration,
     )
@@ -79,4 +112,13 @@ async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
         await apply_ownership_migrations(conn)
+        await apply_media_file_mtime_migration(conn)
+        await apply_issue_flags_migration(conn)
+        await apply_lookup_index_migration(conn)
         await apply_token_encryption_migration(conn)
+
+    if settings.is_sqlite:
+        # The migrations already run under the connect-time pragmas (WAL,
+        # synchronous=NORMAL); refresh planner stats for any new indexes
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("PRAGMA optimize")
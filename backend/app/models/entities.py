@@ -3,13 +3,14 @@
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, BigInteger, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, BigInteger, Text, text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
-def _utcnow() -> datetime:
+def _utcnow(_now=datetime.now, _utc=timezone.utc) -> datetime:
     """Return current UTC time (timezone-aware)."""
-    return datetime.now(timezone.utc)
+    # Bound as defaults so the per-insert column default skips global lookups
+    return _now(_utc)
 
 
 class Base(DeclarativeBase):
@@ -30,24 +31,40 @@ class User(Base):
     plex_token: Mapped[str] = mapped_column(Text, nullable=False)
     plex_thumb_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utcnow, nullable=False
+        DateTime(timezone=True), default=_utcnow, nullable=False
     )
     last_login: Mapped[datetime] = mapped_column(
-        DateTime, default=_utcnow, onupdate=_utcnow, nullable=False
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, nullable=False
     )
 
     # Relationships
     preferences: Mapped[list["UserPreference"]] = relationship(
-        "UserPreference", back_populates="user", cascade="all, delete-orphan"
+        "UserPreference",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     shows: Mapped[list["Show"]] = relationship(
-        "Show", back_populates="user", cascade="all, delete-orphan"
+        "Show",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     media_files: Mapped[list["MediaFile"]] = relationship(
-        "MediaFile", back_populates="user", cascade="all, delete-orphan"
+        "MediaFile",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     scan_locations: Mapped[list["ScanLocation"]] = relationship(
-        "ScanLocation", back_populates="user", cascade="all, delete-orphan"
+        "ScanLocation",
+        back_populates="user",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -64,13 +81,19 @@ class UserPreference(Base):
     value: Mapped[str] = mapped_column(Text, nullable=False)
 
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="preferences")
+    user: Mapped["User"] = relationship(
+        "User", back_populates="preferences", lazy="raise_on_sql"
+    )
 
 
 class Show(Base):
     """Media title model (movie, TV show, or anime)."""
 
     __tablename__ = "shows"
+    __table_args__ = (
+        Index("ix_shows_user_title", "user_id", "title"),
+        Index("ix_shows_user_rating_key", "user_id", "plex_rating_key"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -88,22 +111,29 @@ class Show(Base):
     )  # plex_genre, folder, manual
     thumb_url: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utcnow, nullable=False
+        DateTime(timezone=True), default=_utcnow, nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utcnow, onupdate=_utcnow, nullable=False
+        DateTime(timezone=True), default=_utcnow, onupdate=_utcnow, nullable=False
     )
 
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="shows")
+    user: Mapped["User"] = relationship(
+        "User", back_populates="shows", lazy="raise_on_sql"
+    )
     seasons: Mapped[list["Season"]] = relationship(
-        "Season", back_populates="show", cascade="all, delete-orphan"
+        "Season",
+        back_populates="show",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
     media_files: Mapped[list["MediaFile"]] = relationship(
         "MediaFile",
         back_populates="show",
         foreign_keys="MediaFile.show_id",
         cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
 
@@ -111,6 +141,7 @@ class Season(Base):
     """TV season model."""
 
     __tablename__ = "seasons"
+    __table_args__ = (Index("ix_seasons_show_number", "show_id", "season_number"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     show_id: Mapped[int] = mapped_column(
@@ -121,9 +152,14 @@ class Season(Base):
     plex_rating_key: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
 
     # Relationships
-    show: Mapped["Show"] = relationship("Show", back_populates="seasons")
+    show: Mapped["Show"] = relationship(
+        "Show", back_populates="seasons", lazy="raise_on_sql"
+    )
     media_files: Mapped[list["MediaFile"]] = relationship(
-        "MediaFile", back_populates="season", cascade="all, delete-orphan"
+        "MediaFile",
+        back_populates="season",
+        cascade="all, delete-orphan",
+        lazy="raise_on_sql",
     )
 
 
@@ -131,6 +167,18 @@ class MediaFile(Base):
     """Media file model."""
 
     __tablename__ = "media_files"
+    __table_args__ = (
+        Index("ix_media_files_user_path", "user_id", "file_path"),
+        Index("ix_media_files_show_season", "show_id", "season_id"),
+        Index("ix_media_files_season_id", "season_id"),
+        # Partial: dashboard issue counts only ever read flagged rows
+        Index(
+            "ix_media_files_user_issues",
+            "user_id",
+            sqlite_where=text("has_issues = 1"),
+            postgresql_where=text("has_issues"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
@@ -148,24 +196,40 @@ class MediaFile(Base):
     episode_title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
     file_size: Mapped[int] = mapped_column(BigInteger, nullable=False)
     container_format: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-    duration_ms: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     last_scanned: Mapped[datetime] = mapped_column(
-        DateTime, default=_utcnow, nullable=False
+        DateTime(timezone=True), default=_utcnow, nullable=False
     )
+    # Naive local time from st_mtime, as the legacy incremental check compares it
     last_modified: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    file_mtime_ns: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     has_issues: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     issue_details: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # ISSUE_FLAG_* bits from app.core.preference_engine, kept with issue_details
+    issue_flags: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
 
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="media_files")
+    user: Mapped["User"] = relationship(
+        "User", back_populates="media_files", lazy="raise_on_sql"
+    )
     show: Mapped[Optional["Show"]] = relationship(
-        "Show", back_populates="media_files", foreign_keys=[show_id]
+        "Show",
+        back_populates="media_files",
+        foreign_keys=[show_id],
+        lazy="raise_on_sql",
     )
     season: Mapped[Optional["Season"]] = relationship(
-        "Season", back_populates="media_files"
+        "Season", back_populates="media_files", lazy="raise_on_sql"
     )
+    # Callers load this with selectinload(MediaFile.audio_tracks); SQLAlchemy
+    # sends the parent ids in IN batches of 500, so large pages reuse one
+    # statement shape instead of building an N-bind IN list
     audio_tracks: Mapped[list["AudioTrack"]] = relationship(
-        "AudioTrack", back_populates="media_file", cascade="all, delete-orphan"
+        "AudioTrack",
+        back_populates="media_file",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="raise_on_sql",
     )
 
 
@@ -173,6 +237,9 @@ class AudioTrack(Base):
     """Audio track model."""
 
     __tablename__ = "audio_tracks"
+    __table_args__ = (
+        Index("ix_audio_tracks_media_file_language", "media_file_id", "language"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     media_file_id: Mapped[int] = mapped_column(
@@ -195,7 +262,7 @@ class AudioTrack(Base):
 
     # Relationships
     media_file: Mapped["MediaFile"] = relationship(
-        "MediaFile", back_populates="audio_tracks"
+        "MediaFile", back_populates="audio_tracks", lazy="raise_on_sql"
     )
 
 
@@ -214,11 +281,15 @@ class ScanLocation(Base):
         String(20), default="tv", nullable=False
     )  # tv, movie, anime
     enabled: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
-    last_scanned: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    last_scanned: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
     file_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=_utcnow, nullable=False
+        DateTime(timezone=True), default=_utcnow, nullable=False
     )
 
     # Relationships
-    user: Mapped["User"] = relationship("User", back_populates="scan_locations")
+    user: Mapped["User"] = relationship(
+        "User", back_populates="scan_locations", lazy="raise_on_sql"
+    )
@@ -2,10 +2,116 @@
 
 from __future__ import annotations
 
-from sqlalchemy import inspect, text
+from sqlalchemy import bindparam, text
 from sqlalchemy.ext.asyncio import AsyncConnection
 
-from app.core.encryption import encrypt_value, is_encrypted
+from app.core.encryption import _ENCRYPTED_PREFIX, encrypt_value, is_encrypted
+from app.core.preference_engine import (
+    ISSUE_FLAG_MISSING_DUAL_AUDIO,
+    ISSUE_FLAG_MISSING_ENGLISH,
+    ISSUE_FLAG_MISSING_JAPANESE,
+)
+
+# Rows per executemany batch when backfilling encrypted tokens
+TOKEN_MIGRATION_BATCH_SIZE = 10_000
+
+_OWNED_TABLES = ("shows", "media_files", "scan_locations")
+
+# Statements run on every startup are built once at import
+_OWNER_BACKFILL_STATEMENTS = {
+    table_name: text(f"UPDATE {table_name} SET user_id = :owner_id WHERE user_id IS NULL")
+    for table_name in _OWNED_TABLES
+}
+
+_OWNERSHIP_INDEX_STATEMENTS = (
+    text(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_scan_locations_user_path "
+        "ON scan_locations (user_id, path)"
+    ),
+    text("CREATE INDEX IF NOT EXISTS ix_shows_user_id ON shows (user_id)"),
+    text("CREATE INDEX IF NOT EXISTS ix_media_files_user_id ON media_files (user_id)"),
+    text("CREATE INDEX IF NOT EXISTS ix_scan_locations_user_id ON scan_locations (user_id)"),
+)
+
+_LOOKUP_INDEX_STATEMENTS = (
+    text("CREATE INDEX IF NOT EXISTS ix_shows_user_title ON shows (user_id, title)"),
+    text(
+        "CREATE INDEX IF NOT EXISTS ix_shows_user_rating_key ON shows (user_id, plex_rating_key)"
+    ),
+    text(
+        "CREATE INDEX IF NOT EXISTS ix_seasons_show_number ON seasons (show_id, season_number)"
+    ),
+    text(
+        "CREATE INDEX IF NOT EXISTS ix_media_files_user_path ON media_files (user_id, file_path)"
+    ),
+    text(
+        "CREATE INDEX IF NOT EXISTS ix_media_files_show_season ON media_files (show_id, season_id)"
+    ),
+    text("CREATE INDEX IF NOT EXISTS ix_media_files_season_id ON media_files (season_id)"),
+    text(
+        "CREATE INDEX IF NOT EXISTS ix_audio_tracks_media_file_language "
+        "ON audio_tracks (media_file_id, language)"
+    ),
+)
+
+# Partial index predicates differ: SQLite stores booleans as 0/1 and only
+# uses the index when the query repeats the same comparison
+_ISSUE_INDEX_STATEMENTS = {
+    "sqlite": text(
+        "CREATE INDEX IF NOT EXISTS ix_media_files_user_issues "
+        "ON media_files (user_id) WHERE has_issues = 1"
+    ),
+    "postgresql": text(
+        "CREATE INDEX IF NOT EXISTS ix_media_files_user_issues "
+        "ON media_files (user_id) WHERE has_issues"
+    ),
+}
+
+# issue_details substrings behind each issue_flags bit, including the older
+# snake_case codes; only used to backfill rows scanned before the column
+_ISSUE_FLAG_PATTERNS = {
+    ISSUE_FLAG_MISSING_ENGLISH: (
+        "%missing english audio track%",
+        "%missing english audio for dual audio (anime)%",
+        "%missing_english%",
+    ),
+    ISSUE_FLAG_MISSING_JAPANESE: (
+        "%missing japanese audio track (anime)%",
+        "%missing japanese audio for dual audio (anime)%",
+        "%missing_japanese%",
+    ),
+    ISSUE_FLAG_MISSING_DUAL_AUDIO: (
+        "%missing dual audio (english + japanese) for anime%",
+        "%missing english audio for dual audio (anime)%",
+        "%missing japanese audio for dual audio (anime)%",
+        "%missing_dual_audio%",
+    ),
+}
+
+_UPDATE_USER_TOKEN = text("UPDATE users SET plex_token = :token WHERE id = :id")
+
+
+async def _columns_by_table(conn: AsyncConnection, tables: tuple[str, ...]) -> dict[str, set[str]]:
+    """Return the column names of several tables with a single catalog query."""
+    if conn.dialect.name == "sqlite":
+        query = text(
+            "SELECT m.name, p.name FROM sqlite_master AS m "
+            "JOIN pragma_table_info(m.name) AS p "
+            "WHERE m.type = 'table' AND m.name IN :tables"
+        )
+    else:
+        query = text(
+            "SELECT table_name, column_name FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name IN :tables"
+        )
+    result = await conn.execute(
+        query.bindparams(bindparam("tables", expanding=True)), {"tables": list(tables)}
+    )
+
+    columns: dict[str, set[str]] = {table: set() for table in tables}
+    for table_name, column_name in result:
+        columns[table_name].add(column_name)
+    return columns
 
 
 async def _ensure_bootstrap_user(conn: AsyncConnection) -> int:
@@ -14,77 +120,101 @@ async def _ensure_bootstrap_user(conn: AsyncConnection) -> int:
     if owner_id is not None:
         return int(owner_id)
 
-    result = await conn.execute(
+    # RETURNING hands back the new id in the same round trip on both SQLite
+    # (3.35+) and PostgreSQL, where lastrowid is never populated
+    inserted_id = await conn.scalar(
         text(
             """
             INSERT INTO users (plex_user_id, plex_username, plex_email, plex_token, plex_thumb_url, created_at, last_login)
             VALUES ('bootstrap-owner', 'bootstrap-owner', NULL, :bootstrap_token, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            RETURNING id
             """
         ),
         {"bootstrap_token": encrypt_value("bootstrap-owner-token")},
     )
-
-    inserted_id = result.lastrowid
-    if inserted_id is not None:
-        return int(inserted_id)
-
-    owner_id = await conn.scalar(
-        text("SELECT id FROM users WHERE plex_user_id = 'bootstrap-owner' LIMIT 1")
-    )
-    return int(owner_id)
+    return int(inserted_id)
 
 
 async def apply_token_encryption_migration(conn: AsyncConnection) -> None:
     """Encrypt legacy plaintext Plex tokens in-place."""
-    result = await conn.execute(text("SELECT id, plex_token FROM users"))
-    users = result.fetchall()
+    # Already-encrypted rows are filtered out in SQL, and the rest streamed
+    # so only one batch is held in memory
+    result = await conn.stream(
+        text(
+            "SELECT id, plex_token FROM users "
+            "WHERE plex_token IS NOT NULL AND substr(plex_token, 1, :prefix_length) != :prefix"
+        ),
+        {"prefix_length": len(_ENCRYPTED_PREFIX), "prefix": _ENCRYPTED_PREFIX},
+    )
+    async for users in result.partitions(TOKEN_MIGRATION_BATCH_SIZE):
+        params = [
+            {"token": encrypt_value(plex_token), "id": user_id}
+            for user_id, plex_token in users
+            if plex_token and not is_encrypted(plex_token)
+        ]
+        if params:
+            await conn.execute(_UPDATE_USER_TOKEN, params)
 
-    for user_id, plex_token in users:
-        if plex_token and not is_encrypted(plex_token):
-            await conn.execute(
-                text("UPDATE users SET plex_token = :token WHERE id = :id"),
-                {"token": encrypt_value(plex_token), "id": user_id},
-            )
 
+async def apply_media_file_mtime_migration(conn: AsyncConnection) -> None:
+    """Add the nanosecond mtime column used by incremental scans."""
+    columns = await _columns_by_table(conn, ("media_files",))
+    if "file_mtime_ns" not in columns["media_files"]:
+        await conn.execute(text("ALTER TABLE media_files ADD COLUMN file_mtime_ns BIGINT"))
 
-async def apply_ownership_migrations(conn: AsyncConnection) -> None:
-    """Add per-user ownership columns and backfill old rows."""
-    for table_name in ("shows", "media_files", "scan_locations"):
-        columns = await conn.run_sync(
-            lambda sync_conn, current_table=table_name: {
-                c["name"]
-                for c in inspect(sync_conn).get_columns(current_table)
-            }
-        )
-        if "user_id" not in columns:
-            await conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN user_id INTEGER"))
 
-    owner_id = await _ensure_bootstrap_user(conn)
+async def apply_issue_flags_migration(conn: AsyncConnection) -> None:
+    """Add the issue_flags column and derive it for already scanned files."""
+    columns = await _columns_by_table(conn, ("media_files",))
+    if "issue_flags" in columns["media_files"]:
+        return
 
     await conn.execute(
-        text("UPDATE shows SET user_id = :owner_id WHERE user_id IS NULL"),
-        {"owner_id": owner_id},
-    )
-    await conn.execute(
-        text("UPDATE media_files SET user_id = :owner_id WHERE user_id IS NULL"),
-        {"owner_id": owner_id},
-    )
-    await conn.execute(
-        text("UPDATE scan_locations SET user_id = :owner_id WHERE user_id IS NULL"),
-        {"owner_id": owner_id},
+        text("ALTER TABLE media_files ADD COLUMN issue_flags INTEGER NOT NULL DEFAULT 0")
     )
 
+    # lower() + LIKE matches the dashboard's old ILIKE on both dialects
+    terms = []
+    params = {}
+    for flag, patterns in _ISSUE_FLAG_PATTERNS.items():
+        conditions = []
+        for pattern in patterns:
+            name = f"p{len(params)}"
+            params[name] = pattern
+            conditions.append(f"lower(issue_details) LIKE :{name}")
+        terms.append(f"(CASE WHEN {' OR '.join(conditions)} THEN {flag} ELSE 0 END)")
     await conn.execute(
         text(
-            "CREATE UNIQUE INDEX IF NOT EXISTS uq_scan_locations_user_path ON scan_locations (user_id, path)"
-        )
-    )
-    await conn.execute(
-        text("CREATE INDEX IF NOT EXISTS ix_shows_user_id ON shows (user_id)")
-    )
-    await conn.execute(
-        text("CREATE INDEX IF NOT EXISTS ix_media_files_user_id ON media_files (user_id)")
-    )
-    await conn.execute(
-        text("CREATE INDEX IF NOT EXISTS ix_scan_locations_user_id ON scan_locations (user_id)")
+            f"UPDATE media_files SET issue_flags = {' | '.join(terms)} "
+            "WHERE issue_details IS NOT NULL"
+        ),
+        params,
     )
+
+
+async def apply_lookup_index_migration(conn: AsyncConnection) -> None:
+    """Create the lookup and foreign key indexes on existing databases."""
+    for statement in _LOOKUP_INDEX_STATEMENTS:
+        await conn.execute(statement)
+
+    issue_index = _ISSUE_INDEX_STATEMENTS.get(conn.dialect.name)
+    if issue_index is not None:
+        await conn.execute(issue_index)
+
+
+async def apply_ownership_migrations(conn: AsyncConnection) -> None:
+    """Add per-user ownership columns and backfill old rows."""
+    columns_by_table = await _columns_by_table(conn, _OWNED_TABLES)
+    for table_name in _OWNED_TABLES:
+        if "user_id" not in columns_by_table[table_name]:
+            await conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN user_id INTEGER"))
+
+    owner_id = await _ensure_bootstrap_user(conn)
+
+    # init_db runs every migration inside one engine.begin() transaction, so
+    # these backfills share a single commit
+    for table_name in _OWNED_TABLES:
+        await conn.execute(_OWNER_BACKFILL_STATEMENTS[table_name], {"owner_id": owner_id})
+
+    for statement in _OWNERSHIP_INDEX_STATEMENTS:
+        await conn.execute(statement)
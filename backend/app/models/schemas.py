@@ -1,5 +1,6 @@
 """Pydantic schemas for API request/response models."""
 
+import os
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
@@ -9,6 +10,8 @@ from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 MEDIA_ROOT = Path("/media").resolve()
+_MEDIA_ROOT_STR = str(MEDIA_ROOT)
+_MEDIA_ROOT_PREFIX = os.path.join(_MEDIA_ROOT_STR, "")
 
 
 class ScanMediaType(str, Enum):
@@ -21,6 +24,14 @@ class ScanMediaType(str, Enum):
 
 def validate_media_root_path(path: str) -> str:
     """Validate a normalized absolute path that must stay under /media."""
+    # An accepted path equals its resolved form under MEDIA_ROOT, so anything
+    # not lexically under it is rejected without touching the filesystem.
+    # Everything else is still resolved, which catches symlink escapes.
+    if isinstance(path, str) and os.path.isabs(path):
+        lexical = os.path.normpath(path)
+        if lexical != _MEDIA_ROOT_STR and not lexical.startswith(_MEDIA_ROOT_PREFIX):
+            raise ValueError("Path must be under /media.")
+
     try:
         resolved = Path(path).resolve()
     except (TypeError, ValueError, OSError) as exc:
@@ -29,12 +40,11 @@ def validate_media_root_path(path: str) -> str:
     if not resolved.is_absolute():
         raise ValueError("Path must be absolute and under /media.")
 
-    try:
-        resolved.relative_to(MEDIA_ROOT)
-    except ValueError as exc:
-        raise ValueError("Path must be under /media.") from exc
-
+    # String prefix check; relative_to would split both paths into parts
     normalized = str(resolved)
+    if normalized != _MEDIA_ROOT_STR and not normalized.startswith(_MEDIA_ROOT_PREFIX):
+        raise ValueError("Path must be under /media.")
+
     if path != normalized:
         raise ValueError(f"Path must be normalized. Use '{normalized}'.")
 
@@ -155,7 +165,7 @@ class ScanStartRequest(BaseModel):
 class AudioTrackResponse(BaseModel):
     """Audio track information."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: int
     track_index: int
@@ -176,7 +186,7 @@ class AudioTrackResponse(BaseModel):
 class MediaFileResponse(BaseModel):
     """Media file information."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: int
     file_path: str
@@ -192,23 +202,28 @@ class MediaFileResponse(BaseModel):
     audio_tracks: list[AudioTrackResponse] = []
 
 
-class MediaFileListResponse(BaseModel):
-    """Paginated media file list."""
+class PaginatedResponse(BaseModel):
+    """Pagination fields shared by the list responses."""
 
-    items: list[MediaFileResponse]
     total: int
     page: int
     page_size: int
     pages: int
 
 
+class MediaFileListResponse(PaginatedResponse):
+    """Paginated media file list."""
+
+    items: list[MediaFileResponse]
+
+
 # ============== Season Schemas ==============
 
 
 class SeasonResponse(BaseModel):
     """Season information."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: int
     season_number: int
@@ -228,7 +243,7 @@ class SeasonDetailResponse(SeasonResponse):
 class ShowResponse(BaseModel):
     """Show information."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
     id: int
     title: str
@@ -259,14 +274,10 @@ class ShowUpdate(BaseModel):
     anime_source: Optional[str] = None
 
 
-class ShowListResponse(BaseModel):
+class ShowListResponse(PaginatedResponse):
     """Paginated show list."""
 
     items: list[ShowResponse]
-    total: int
-    page: int
-    page_size: int
-    pages: int
 
 
 # ============== Settings Schemas ==============
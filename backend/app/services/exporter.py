@@ -1,42 +1,182 @@
 """Export service for generating CSV and JSON reports."""
 
 import csv
-import json
 import io
-from typing import Any
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
+from operator import attrgetter, itemgetter
+from typing import Any, Optional, TextIO
+
+import orjson
+
+# Rows written per writerows call (and per chunk) in a streamed CSV export
+CSV_BATCH_ROWS = 1000
+
+_MEDIA_FILE_CSV_COLUMNS = (
+    "id", "filename", "file_path", "episode_number", "episode_title",
+    "file_size_mb", "container", "audio_track_count", "audio_languages",
+    "audio_codecs", "has_issues", "issue_details",
+)
+
+_SHOW_CSV_COLUMNS = (
+    "id", "title", "is_anime", "anime_source",
+    "season_count", "episode_count", "issues_count",
+)
+
+
+# Export fields with the defaults used when an object lacks one; ORM rows and
+# response models have them all, so the attrgetter fast path almost always hits
+_MEDIA_FILE_DEFAULTS = {
+    'id': None,
+    'file_path': None,
+    'filename': None,
+    'episode_number': None,
+    'episode_title': None,
+    'file_size': None,
+    'container_format': None,
+    'has_issues': False,
+    'issue_details': None,
+    'audio_tracks': [],
+}
+_get_media_file_values = attrgetter(*_MEDIA_FILE_DEFAULTS)
+_get_audio_track_values = attrgetter('language', 'language_raw', 'codec')
+
+# Key order of the export dictionaries; CSV rows are the same values picked
+# into column order by index, so no per-row dict is built for them
+_MEDIA_FILE_EXPORT_FIELDS = (
+    "id", "file_path", "filename", "episode_number", "episode_title",
+    "file_size_mb", "container", "has_issues", "issue_details",
+    "audio_languages", "audio_codecs", "audio_track_count",
+)
+_to_csv_order = itemgetter(*map(_MEDIA_FILE_EXPORT_FIELDS.index, _MEDIA_FILE_CSV_COLUMNS))
+
+_SHOW_DEFAULTS = {
+    'id': None,
+    'title': None,
+    'is_anime': False,
+    'anime_source': None,
+    'season_count': 0,
+    'episode_count': 0,
+    'issues_count': 0,
+}
+_get_show_values = attrgetter(*_SHOW_DEFAULTS)
+
+
+def _drain(buffer: io.StringIO) -> str:
+    """Return the buffered text and reset the buffer for reuse."""
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+def _media_file_values(mf: Any) -> tuple:
+    """Return the exported media file attributes in _MEDIA_FILE_DEFAULTS order."""
+    try:
+        return _get_media_file_values(mf)
+    except AttributeError:
+        return tuple(getattr(mf, name, default) for name, default in _MEDIA_FILE_DEFAULTS.items())
+
+
+def _uniform_type(rows: list[Any]) -> Optional[type]:
+    """Return the one type shared by every row, or None for mixed or empty input."""
+    # map/set run in C, so this costs far less than a per-row branch
+    row_types = set(map(type, rows))
+    return row_types.pop() if len(row_types) == 1 else None
+
+
+def _media_file_export_dict(mf: Any) -> dict:
+    """Return a media file's export dictionary."""
+    return dict(zip(_MEDIA_FILE_EXPORT_FIELDS, _media_file_row(mf)))
+
+
+def _show_values(show: Any) -> tuple:
+    """Return the exported show attributes in _SHOW_DEFAULTS order."""
+    try:
+        return _get_show_values(show)
+    except AttributeError:
+        return tuple(getattr(show, name, default) for name, default in _SHOW_DEFAULTS.items())
+
+
+def _audio_track_values(track: Any) -> tuple:
+    """Return (language, language_raw, codec) for an audio track."""
+    try:
+        return _get_audio_track_values(track)
+    except AttributeError:
+        return (
+            getattr(track, 'language', None),
+            getattr(track, 'language_raw', 'Unknown'),
+            getattr(track, 'codec', None),
+        )
+
+
+def _media_file_row(mf: Any) -> tuple:
+    """Return a media file's export values in _MEDIA_FILE_EXPORT_FIELDS order."""
+    (
+        mf_id, file_path, filename, episode_number, episode_title,
+        file_size, container, has_issues, issue_details, audio_tracks,
+    ) = _media_file_values(mf)
+
+    # One pass over the tracks; a row's handful of tracks made separate
+    # comprehensions cost more than the work itself
+    languages = []
+    codecs = []
+    if audio_tracks:
+        for language, language_raw, codec in map(_audio_track_values, audio_tracks):
+            lang = language or language_raw
+            if lang:
+                languages.append(lang)
+            if codec:
+                codecs.append(codec)
+
+    return (
+        mf_id,
+        file_path,
+        filename,
+        episode_number,
+        episode_title,
+        round((file_size or 0) / (1024 * 1024), 2),
+        container,
+        has_issues,
+        issue_details,
+        ", ".join(languages),
+        ", ".join(codecs),
+        len(audio_tracks) if audio_tracks else 0,
+    )
 
 
 class Exporter:
     """Service for exporting media data to various formats."""
 
     @staticmethod
-    def to_csv(data: list[dict], columns: list[str] = None) -> str:
+    def to_csv(data: list[dict], columns: Optional[Sequence[str]] = None, out: Optional[TextIO] = None) -> str:
         """
         Export data to CSV format.
         
         Args:
             data: List of dictionaries to export
-            columns: Optional list of column names to include (default: all keys)
+            columns: Optional column names to include (default: all keys)
+            out: Optional text sink to write into instead of buffering a string
         
         Returns:
-            CSV string
+            CSV string, or an empty string when the rows went to ``out``
         """
         if not data:
             return ""
         
         # Determine columns
         if columns is None:
-            columns = list(data[0].keys())
+            columns = tuple(data[0])
         
-        output = io.StringIO()
+        output = io.StringIO() if out is None else out
         writer = csv.DictWriter(output, fieldnames=columns, extrasaction='ignore')
         writer.writeheader()
         writer.writerows(data)
         
-        return output.getvalue()
+        return output.getvalue() if out is None else ""
 
     @staticmethod
-    def to_json(data: list[dict], pretty: bool = True) -> str:
+    def to_json(data: list[dict], pretty: bool = True) -> bytes:
         """
         Export data to JSON format.
         
@@ -45,14 +185,16 @@ class Exporter:
             pretty: Whether to format with indentation
         
         Returns:
-            JSON string
+            UTF-8 encoded JSON, ready to use as a response body
         """
-        if pretty:
-            return json.dumps(data, indent=2, default=str)
-        return json.dumps(data, default=str)
+        # Datetimes are encoded natively as ISO 8601; default=str only sees
+        # the rare type orjson has no encoder for. Naive values stay naive,
+        # since last_modified is local time rather than UTC
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        return orjson.dumps(data, default=str, option=option)
 
-    @staticmethod
-    def media_files_to_export_format(media_files: list[Any]) -> list[dict]:
+    @classmethod
+    def media_files_to_export_format(cls, media_files: list[Any]) -> list[dict]:
         """
         Convert media file objects to export-friendly dictionaries.
         
@@ -62,49 +204,34 @@ class Exporter:
         Returns:
             List of flat dictionaries suitable for export
         """
-        result = []
-        
+        # Query results are homogeneous, so the row type is settled once
+        # instead of per row; mixed input takes the per-row path
+        row_type = _uniform_type(media_files)
+        if row_type is dict:
+            return list(media_files)
+        if row_type is not None and hasattr(media_files[0], '__dict__'):
+            return list(map(_media_file_export_dict, media_files))
+        return list(cls.iter_media_files_export_format(media_files))
+
+    @staticmethod
+    def iter_media_files_export_format(media_files: Iterable[Any]) -> Iterator[dict]:
+        """Yield export dictionaries one media file at a time."""
         for mf in media_files:
             # Handle both ORM objects and Pydantic models
             if hasattr(mf, '__dict__'):
-                data = {
-                    "id": getattr(mf, 'id', None),
-                    "file_path": getattr(mf, 'file_path', None),
-                    "filename": getattr(mf, 'filename', None),
-                    "episode_number": getattr(mf, 'episode_number', None),
-                    "episode_title": getattr(mf, 'episode_title', None),
-                    "file_size_mb": round((getattr(mf, 'file_size', None) or 0) / (1024 * 1024), 2),
-                    "container": getattr(mf, 'container_format', None),
-                    "has_issues": getattr(mf, 'has_issues', False),
-                    "issue_details": getattr(mf, 'issue_details', None),
-                }
-                
-                # Add audio track info
-                audio_tracks = getattr(mf, 'audio_tracks', [])
-                if audio_tracks:
-                    languages = []
-                    codecs = []
-                    for track in audio_tracks:
-                        lang = getattr(track, 'language', None) or getattr(track, 'language_raw', 'Unknown')
-                        if lang:
-                            languages.append(lang)
-                        codec = getattr(track, 'codec', None)
-                        if codec:
-                            codecs.append(codec)
-                    
-                    data["audio_languages"] = ", ".join(languages)
-                    data["audio_codecs"] = ", ".join(codecs)
-                    data["audio_track_count"] = len(audio_tracks)
-                else:
-                    data["audio_languages"] = ""
-                    data["audio_codecs"] = ""
-                    data["audio_track_count"] = 0
-                
-                result.append(data)
+                yield _media_file_export_dict(mf)
             elif isinstance(mf, dict):
-                result.append(mf)
-        
-        return result
+                yield mf
+
+    @staticmethod
+    def iter_media_files_csv_rows(media_files: Iterable[Any]) -> Iterator[tuple]:
+        """Yield CSV rows as tuples in _MEDIA_FILE_CSV_COLUMNS order."""
+        for mf in media_files:
+            if hasattr(mf, '__dict__'):
+                yield _to_csv_order(_media_file_row(mf))
+            elif isinstance(mf, dict):
+                # Same rules as DictWriter: extra keys dropped, missing ones blank
+                yield tuple(mf.get(column, "") for column in _MEDIA_FILE_CSV_COLUMNS)
 
     @staticmethod
     def shows_to_export_format(shows: list[Any]) -> list[dict]:
@@ -117,38 +244,46 @@ class Exporter:
         Returns:
             List of flat dictionaries suitable for export
         """
-        result = []
-        
-        for show in shows:
-            if hasattr(show, '__dict__'):
-                data = {
-                    "id": getattr(show, 'id', None),
-                    "title": getattr(show, 'title', None),
-                    "is_anime": getattr(show, 'is_anime', False),
-                    "anime_source": getattr(show, 'anime_source', None),
-                    "season_count": getattr(show, 'season_count', 0),
-                    "episode_count": getattr(show, 'episode_count', 0),
-                    "issues_count": getattr(show, 'issues_count', 0),
-                }
-                result.append(data)
-            elif isinstance(show, dict):
-                result.append(show)
-        
-        return result
+        row_type = _uniform_type(shows)
+        if row_type is dict:
+            return list(shows)
+        if row_type is not None and hasattr(shows[0], '__dict__'):
+            return [dict(zip(_SHOW_DEFAULTS, values)) for values in map(_show_values, shows)]
+        # Objects and dicts are exported; anything else is dropped, as for media files
+        return [
+            dict(zip(_SHOW_DEFAULTS, _show_values(show))) if hasattr(show, '__dict__') else show
+            for show in shows
+            if hasattr(show, '__dict__') or isinstance(show, dict)
+        ]
 
     @classmethod
     def export_media_files_csv(cls, media_files: list[Any]) -> str:
         """Export media files to CSV."""
-        data = cls.media_files_to_export_format(media_files)
-        columns = [
-            "id", "filename", "file_path", "episode_number", "episode_title",
-            "file_size_mb", "container", "audio_track_count", "audio_languages",
-            "audio_codecs", "has_issues", "issue_details"
-        ]
-        return cls.to_csv(data, columns)
+        return "".join(cls.iter_media_files_csv(media_files))
 
     @classmethod
-    def export_media_files_json(cls, media_files: list[Any]) -> str:
+    def iter_media_files_csv(cls, media_files: list[Any]) -> Iterator[str]:
+        """Yield the media file CSV export in chunks for a streaming response."""
+        if not media_files:
+            return
+        
+        # Tuple rows are built lazily and written a batch at a time into a
+        # small reusable buffer, so neither the rows nor the CSV text for the
+        # whole export are ever held at once
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(_MEDIA_FILE_CSV_COLUMNS)
+        row_type = _uniform_type(media_files)
+        if row_type is not None and row_type is not dict and hasattr(media_files[0], '__dict__'):
+            rows = map(_to_csv_order, map(_media_file_row, media_files))
+        else:
+            rows = cls.iter_media_files_csv_rows(media_files)
+        while batch := list(islice(rows, CSV_BATCH_ROWS)):
+            writer.writerows(batch)
+            yield _drain(buffer)
+
+    @classmethod
+    def export_media_files_json(cls, media_files: list[Any]) -> bytes:
         """Export media files to JSON."""
         data = cls.media_files_to_export_format(media_files)
         return cls.to_json(data)
@@ -157,14 +292,10 @@ class Exporter:
     def export_shows_csv(cls, shows: list[Any]) -> str:
         """Export shows to CSV."""
         data = cls.shows_to_export_format(shows)
-        columns = [
-            "id", "title", "is_anime", "anime_source",
-            "season_count", "episode_count", "issues_count"
-        ]
-        return cls.to_csv(data, columns)
+        return cls.to_csv(data, _SHOW_CSV_COLUMNS)
 
     @classmethod
-    def export_shows_json(cls, shows: list[Any]) -> str:
+    def export_shows_json(cls, shows: list[Any]) -> bytes:
         """Export shows to JSON."""
         data = cls.shows_to_export_format(shows)
         return cls.to_json(data)
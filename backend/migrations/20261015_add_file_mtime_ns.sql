@@ -0,0 +1,6 @@
+-- Nanosecond modification time recorded at scan time, so incremental scans
+-- can skip unchanged files without a float-precision mtime comparison.
+-- The runtime migration helper in app.models.migrations adds the same column
+-- on startup for both SQLite and PostgreSQL.
+
+ALTER TABLE media_files ADD COLUMN IF NOT EXISTS file_mtime_ns BIGINT;
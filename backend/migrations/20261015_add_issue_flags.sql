@@ -0,0 +1,6 @@
+-- Typed issue categories for the dashboard counters:
+-- 1 = missing English, 2 = missing Japanese, 4 = missing dual audio (anime).
+-- The runtime migration helper in app.models.migrations adds the same column
+-- on startup and backfills it from issue_details for both SQLite and PostgreSQL.
+
+ALTER TABLE media_files ADD COLUMN IF NOT EXISTS issue_flags INTEGER NOT NULL DEFAULT 0;
@@ -0,0 +1,5 @@
+-- Partial index for the dashboard's issue counts, which only read flagged rows.
+-- The runtime migration helper in app.models.migrations creates the same index
+-- on startup, with an SQLite-specific predicate.
+
+CREATE INDEX IF NOT EXISTS ix_media_files_user_issues ON media_files (user_id) WHERE has_issues;
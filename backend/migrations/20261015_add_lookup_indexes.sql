@@ -0,0 +1,13 @@
+-- Composite indexes for the scanner's per-file lookups.
+-- The runtime migration helper in app.models.migrations creates the same indexes
+-- on startup for both SQLite and PostgreSQL.
+
+CREATE INDEX IF NOT EXISTS ix_shows_user_title ON shows (user_id, title);
+CREATE INDEX IF NOT EXISTS ix_shows_user_rating_key ON shows (user_id, plex_rating_key);
+CREATE INDEX IF NOT EXISTS ix_seasons_show_number ON seasons (show_id, season_number);
+CREATE INDEX IF NOT EXISTS ix_media_files_user_path ON media_files (user_id, file_path);
+
+-- Foreign key columns used by the media API joins, counts and cascading deletes.
+CREATE INDEX IF NOT EXISTS ix_media_files_show_season ON media_files (show_id, season_id);
+CREATE INDEX IF NOT EXISTS ix_media_files_season_id ON media_files (season_id);
+CREATE INDEX IF NOT EXISTS ix_audio_tracks_media_file_language ON audio_tracks (media_file_id, language);
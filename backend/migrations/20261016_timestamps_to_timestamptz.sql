@@ -0,0 +1,21 @@
+-- UTC timestamp columns are declared DateTime(timezone=True); convert existing
+-- PostgreSQL columns to TIMESTAMPTZ. Stored values were naive UTC, so they are
+-- interpreted AT TIME ZONE 'UTC' rather than in the server's time zone.
+-- PostgreSQL only: SQLite has no column types to change. Already-converted
+-- columns would be shifted again, so run this once per database.
+-- media_files.last_modified stays naive local time from st_mtime.
+
+ALTER TABLE users
+    ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC',
+    ALTER COLUMN last_login TYPE TIMESTAMPTZ USING last_login AT TIME ZONE 'UTC';
+
+ALTER TABLE shows
+    ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC',
+    ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC';
+
+ALTER TABLE media_files
+    ALTER COLUMN last_scanned TYPE TIMESTAMPTZ USING last_scanned AT TIME ZONE 'UTC';
+
+ALTER TABLE scan_locations
+    ALTER COLUMN last_scanned TYPE TIMESTAMPTZ USING last_scanned AT TIME ZONE 'UTC',
+    ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC';
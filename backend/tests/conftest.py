@@ -1,4 +1,153 @@
 import sys
 from pathlib import Path
 
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+try:
+    # Installed with uvicorn[standard] everywhere except Windows
+    import uvloop
+except ImportError:
+    uvloop = None
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.api.media import router as media_router  # noqa: E402
+from app.api.scan import router as scan_router  # noqa: E402
+from app.api.settings import router as settings_router  # noqa: E402
+from app.core.scan_state import scan_state_manager  # noqa: E402
+from app.models.database import get_db  # noqa: E402
+from app.models.entities import Base  # noqa: E402
+
+
+def _set_memory_db_pragmas(dbapi_connection, connection_record):
+    # Throwaway databases need no durability, so skip syncs and keep the
+    # journal and temp tables in memory
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA locking_mode=EXCLUSIVE")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.close()
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run anyio tests on asyncio only, and let async fixtures share one loop."""
+    if uvloop is None:
+        return "asyncio"
+    # The loop the server runs on under uvicorn, with a cheaper scheduler
+    return "asyncio", {"loop_factory": uvloop.new_event_loop}
+
+
+@pytest.fixture(scope="session")
+def make_memory_engine():
+    """Return a factory for in-memory SQLite engines with test pragmas."""
+
+    def make():
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        event.listen(engine.sync_engine, "connect", _set_memory_db_pragmas)
+        return engine
+
+    return make
+
+
+@pytest.fixture(scope="session")
+async def db_engine(make_memory_engine):
+    """One in-memory schema for the whole run; see db_connection for isolation."""
+    # The in-memory database lives on a single pooled connection
+    engine = make_memory_engine()
+
+    # The driver's implicit BEGIN would let a RELEASE SAVEPOINT commit, so
+    # SQLAlchemy emits BEGIN itself and the outer rollback really discards
+    @event.listens_for(engine.sync_engine, "connect")
+    def _disable_driver_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    # A fresh in-memory database has no tables, so skip create_all's
+    # per-table existence checks
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all, checkfirst=False)
+
+    yield engine
+
+    await engine.dispose()
+
+
+@pytest.fixture
+async def db_connection(db_engine):
+    """A connection inside a transaction that is rolled back after the test."""
+    async with db_engine.connect() as conn:
+        transaction = await conn.begin()
+        yield conn
+        await transaction.rollback()
+
+
+@pytest.fixture
+def db_session_maker(db_connection):
+    """Session factory on db_connection; commits only release a SAVEPOINT."""
+    return async_sessionmaker(
+        bind=db_connection,
+        expire_on_commit=False,
+        class_=AsyncSession,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture
+async def db_session(db_session_maker):
+    """One session from db_session_maker for the whole test."""
+    async with db_session_maker() as session:
+        yield session
+
+
+@pytest.fixture(scope="session")
+def api_app():
+    """The API routers on one app; fixtures set dependency overrides per test."""
+    app = FastAPI()
+    app.include_router(scan_router, prefix="/api/scan")
+    app.include_router(media_router, prefix="/api/media")
+    app.include_router(settings_router, prefix="/api/settings")
+    return app
+
+
+@pytest.fixture(scope="session")
+async def client(api_app):
+    """One AsyncClient on api_app for the whole run."""
+    transport = ASGITransport(app=api_app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def override_get_db(api_app, db_session_maker):
+    """Serve get_db from db_session_maker, committing per request like the real one."""
+
+    async def override_db():
+        async with db_session_maker() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    api_app.dependency_overrides[get_db] = override_db
+    yield
+    api_app.dependency_overrides.clear()
+
+
+@pytest.fixture(autouse=True)
+def _scan_state():
+    """Give every test a clean scan state manager."""
+    scan_state_manager.reset()
+    yield
+    scan_state_manager.reset()
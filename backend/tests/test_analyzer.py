@@ -0,0 +1,27 @@
+"""Tests for audio analyzer helpers."""
+
+import unittest
+
+from app.core.analyzer import normalize_language
+
+
+class NormalizeLanguageTests(unittest.TestCase):
+    def test_known_codes_and_names_normalize_to_iso_639_1(self):
+        self.assertEqual(normalize_language("en"), "en")
+        self.assertEqual(normalize_language(" ENG "), "en")
+        self.assertEqual(normalize_language("ger"), "de")
+        self.assertEqual(normalize_language("Japanese"), "ja")
+
+    def test_undefined_and_empty_values_return_none(self):
+        self.assertIsNone(normalize_language(None))
+        self.assertIsNone(normalize_language(""))
+        self.assertIsNone(normalize_language("und"))
+        self.assertIsNone(normalize_language("x"))
+
+    def test_unknown_codes_fall_back_to_two_letter_prefix(self):
+        self.assertEqual(normalize_language("el"), "el")
+        self.assertEqual(normalize_language("gre"), "gr")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,12 +4,17 @@ import unittest
 from unittest.mock import patch
 
 from app.core.audio_fixer import (
+    _mkvpropedit_path,
     find_track_index_for_language,
     set_default_track_by_index,
 )
 
 
 class AudioFixerTests(unittest.TestCase):
+    def setUp(self):
+        _mkvpropedit_path.cache_clear()
+        self.addCleanup(_mkvpropedit_path.cache_clear)
+
     def test_find_track_index_for_language(self):
         tracks = [
             {"index": 0, "language": "ja"},
@@ -19,6 +24,15 @@ class AudioFixerTests(unittest.TestCase):
         self.assertEqual(find_track_index_for_language(tracks, "en"), 1)
         self.assertIsNone(find_track_index_for_language(tracks, "fr"))
 
+    def test_find_track_index_for_language_returns_first_indexed_track(self):
+        tracks = [
+            {"index": None, "language": "en"},
+            {"index": 1, "language": "EN"},
+            {"index": 2, "language": "en"},
+        ]
+
+        self.assertEqual(find_track_index_for_language(tracks, " En "), 1)
+
     def test_set_default_track_by_index_builds_command(self):
         tracks = [
             {"index": 0, "language": "ja"},
@@ -36,6 +50,56 @@ class AudioFixerTests(unittest.TestCase):
         self.assertIn("track:a1", command)
         self.assertIn("track:a2", command)
 
+    def test_set_default_track_by_index_only_edits_changed_flags(self):
+        tracks = [
+            {"index": 0, "language": "ja", "is_default": True},
+            {"index": 1, "language": "en", "is_default": False},
+            {"index": 2, "language": "es", "is_default": False},
+        ]
+
+        with (
+            patch("app.core.audio_fixer.shutil.which", return_value="/usr/bin/mkvpropedit"),
+            patch("app.core.audio_fixer.subprocess.run") as run_mock,
+        ):
+            ok = set_default_track_by_index("/media/movie/file.mkv", tracks, 1)
+
+        self.assertTrue(ok)
+        command = run_mock.call_args.args[0]
+        self.assertEqual(
+            command,
+            [
+                "mkvpropedit",
+                "/media/movie/file.mkv",
+                "--edit",
+                "track:a1",
+                "--set",
+                "flag-default=0",
+                "--edit",
+                "track:a2",
+                "--set",
+                "flag-default=1",
+            ],
+        )
+
+    def test_set_default_track_by_index_writes_target_even_when_stored_as_default(self):
+        tracks = [
+            {"index": 0, "language": "ja", "is_default": False},
+            {"index": 1, "language": "en", "is_default": True},
+        ]
+
+        with (
+            patch("app.core.audio_fixer.shutil.which", return_value="/usr/bin/mkvpropedit"),
+            patch("app.core.audio_fixer.subprocess.run") as run_mock,
+        ):
+            ok = set_default_track_by_index("/media/movie/file.mkv", tracks, 1)
+
+        self.assertTrue(ok)
+        # Stored flags may be stale, so the target is written regardless
+        self.assertEqual(
+            run_mock.call_args.args[0],
+            ["mkvpropedit", "/media/movie/file.mkv", "--edit", "track:a2", "--set", "flag-default=1"],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,153 @@
+"""Tests for SQLite connection setup, relationship loading and database-level cascades."""
+
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import event, func, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.auth import get_current_user
+from app.models.database import set_sqlite_pragma
+from app.models.entities import AudioTrack, Base, MediaFile, Season, Show, User
+from app.models.migrations import apply_issue_flags_migration, apply_ownership_migrations
+
+
+@pytest.mark.anyio
+async def test_deleting_a_user_cascades_in_the_database():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragma)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_maker() as session:
+        user = User(plex_user_id="1", plex_username="user", plex_token="token")
+        session.add(Season(show=Show(user=user, title="Show"), season_number=1))
+        await session.commit()
+        session.expunge_all()
+
+        # Children are never loaded; the foreign keys delete them
+        await session.delete(await session.get(User, user.id))
+        await session.commit()
+
+        assert await session.scalar(select(func.count(Show.id))) == 0
+        assert await session.scalar(select(func.count(Season.id))) == 0
+
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_detail_endpoints_eager_load_relationships(
+    db_session_maker, api_app, override_get_db, client
+):
+    async with db_session_maker() as session:
+        user = User(plex_user_id="1", plex_username="user", plex_token="token")
+        show = Show(user=user, title="Show", media_type="tv")
+        season = Season(show=show, season_number=1)
+        session.add(
+            MediaFile(
+                user=user,
+                show=show,
+                season=season,
+                file_path="/media/Show/Season 01/E01.mkv",
+                filename="E01.mkv",
+                episode_number=1,
+                file_size=100,
+                last_modified=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                audio_tracks=[AudioTrack(track_index=0, language="en", is_default=True)],
+            )
+        )
+        await session.commit()
+        show_id = show.id
+
+    async with db_session_maker() as session:
+        loaded = await session.get(Show, show_id)
+        # Relationships must be eager-loaded explicitly instead of lazily per row
+        with pytest.raises(InvalidRequestError):
+            loaded.seasons
+
+    async def override_current_user():
+        return user
+
+    api_app.dependency_overrides[get_current_user] = override_current_user
+
+    show_url = f"/api/media/shows/{show_id}"
+    show_resp = await client.get(show_url)
+    season_resp = await client.get(f"{show_url}/seasons/1")
+
+    assert show_resp.status_code == 200
+    assert show_resp.json()["seasons"][0]["episode_count"] == 1
+    assert season_resp.status_code == 200
+    episode = season_resp.json()["media_files"][0]
+    assert episode["audio_tracks"][0]["language"] == "en"
+
+
+@pytest.mark.anyio
+async def test_sqlite_connections_use_wal_and_normal_sync(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'trackhound.db'}")
+    event.listen(engine.sync_engine, "connect", set_sqlite_pragma)
+
+    async with engine.begin() as conn:
+        assert await conn.scalar(text("PRAGMA journal_mode")) == "wal"
+        # 1 == NORMAL; startup migrations avoid an fsync per statement
+        assert await conn.scalar(text("PRAGMA synchronous")) == 1
+        assert await conn.scalar(text("PRAGMA temp_store")) == 2
+
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_issue_counts_use_the_partial_index(db_connection):
+    query = select(func.count(MediaFile.id)).where(
+        MediaFile.user_id == 1, MediaFile.has_issues == True
+    )
+    compiled = query.compile(db_connection.sync_connection, compile_kwargs={"literal_binds": True})
+    plan = (await db_connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}")).all()
+
+    assert "ix_media_files_user_issues" in " ".join(str(row) for row in plan)
+
+
+@pytest.mark.anyio
+async def test_ownership_migration_creates_a_bootstrap_owner(db_connection):
+    conn = db_connection
+    await apply_ownership_migrations(conn)
+
+    owner_id = await conn.scalar(
+        text("SELECT id FROM users WHERE plex_user_id = 'bootstrap-owner'")
+    )
+    assert owner_id is not None
+    assert owner_id == await conn.scalar(text("SELECT MIN(id) FROM users"))
+
+    # A second run reuses the existing owner instead of inserting another
+    await apply_ownership_migrations(conn)
+    assert await conn.scalar(text("SELECT COUNT(*) FROM users")) == 1
+
+
+@pytest.mark.anyio
+async def test_issue_flags_migration_backfills_scanned_rows():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE media_files (id INTEGER PRIMARY KEY, issue_details TEXT)")
+        )
+        await conn.execute(
+            text("INSERT INTO media_files (id, issue_details) VALUES (:id, :details)"),
+            [
+                {"id": 1, "details": "Missing English audio track"},
+                {"id": 2, "details": "Missing Japanese audio for dual audio (anime)"},
+                {"id": 3, "details": "missing_english; missing_dual_audio"},
+                {"id": 4, "details": None},
+            ],
+        )
+
+        await apply_issue_flags_migration(conn)
+        # A second startup leaves the column alone
+        await apply_issue_flags_migration(conn)
+
+        flags = (await conn.execute(text("SELECT issue_flags FROM media_files ORDER BY id"))).scalars()
+        assert list(flags) == [1, 2 | 4, 1 | 4, 0]
+
+    await engine.dispose()
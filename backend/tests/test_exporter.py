@@ -0,0 +1,116 @@
+"""Tests for media file export formatting."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.services.exporter import _MEDIA_FILE_CSV_COLUMNS, Exporter
+
+
+def _media_file(**overrides):
+    values = {
+        "id": 1,
+        "file_path": "/media/tv/Show/E01.mkv",
+        "filename": "E01.mkv",
+        "episode_number": 1,
+        "episode_title": None,
+        "file_size": 5 * 1024 * 1024,
+        "container_format": "mkv",
+        "has_issues": True,
+        "issue_details": "Missing English audio track",
+        "audio_tracks": [],
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_media_files_export_format_flattens_audio_tracks():
+    tracks = [
+        SimpleNamespace(language=None, language_raw="jpn", codec="AAC"),
+        SimpleNamespace(language="en", language_raw="eng", codec=None),
+    ]
+
+    [row] = Exporter.media_files_to_export_format([_media_file(audio_tracks=tracks)])
+
+    assert row["file_size_mb"] == 5.0
+    assert row["container"] == "mkv"
+    assert row["audio_languages"] == "jpn, en"
+    assert row["audio_codecs"] == "AAC"
+    assert row["audio_track_count"] == 2
+
+
+def test_media_files_export_format_defaults_missing_attributes():
+    partial = SimpleNamespace(id=2, file_path="/media/movie.mkv")
+    track_without_language = SimpleNamespace(codec="DTS")
+
+    rows = Exporter.media_files_to_export_format(
+        [partial, _media_file(audio_tracks=[track_without_language]), {"id": 3}]
+    )
+
+    assert rows[0]["filename"] is None
+    assert rows[0]["has_issues"] is False
+    assert rows[0]["audio_track_count"] == 0
+    assert rows[1]["audio_languages"] == "Unknown"
+    assert rows[2] == {"id": 3}
+
+
+def test_exporters_drop_rows_that_are_neither_objects_nor_dicts():
+    assert Exporter.shows_to_export_format([None, 5]) == []
+    assert Exporter.media_files_to_export_format([None, 5]) == []
+    assert Exporter.shows_to_export_format([None, {"id": 3}]) == [{"id": 3}]
+
+
+def test_uniform_batches_match_the_per_row_path():
+    tracks = [SimpleNamespace(language="en", language_raw="eng", codec="AAC")]
+    files = [_media_file(audio_tracks=tracks), _media_file(id=2, episode_title="Pilot")]
+
+    expected = list(Exporter.iter_media_files_export_format(files))
+
+    assert Exporter.media_files_to_export_format(files) == expected
+    assert Exporter.export_media_files_csv(files) == Exporter.to_csv(expected, _MEDIA_FILE_CSV_COLUMNS)
+    assert Exporter.media_files_to_export_format([{"id": 3}]) == [{"id": 3}]
+
+
+def test_streamed_csv_matches_buffered_export(monkeypatch):
+    monkeypatch.setattr("app.services.exporter.CSV_BATCH_ROWS", 1)
+    files = [_media_file(id=index, filename=f"E{index:02d}.mkv") for index in range(3)]
+
+    chunks = list(Exporter.iter_media_files_csv(files))
+
+    assert len(chunks) == 3  # the header goes out with the first row
+    assert "".join(chunks) == Exporter.export_media_files_csv(files)
+    assert list(Exporter.iter_media_files_csv([])) == []
+
+
+def test_csv_tuple_rows_match_dict_writer_output():
+    tracks = [SimpleNamespace(language="en", language_raw="eng", codec="AAC")]
+    files = [_media_file(audio_tracks=tracks), _media_file(id=2, episode_title="Pilot"), {"id": 3, "extra": "x"}]
+
+    expected = Exporter.to_csv(Exporter.media_files_to_export_format(files), _MEDIA_FILE_CSV_COLUMNS)
+
+    assert Exporter.export_media_files_csv(files) == expected
+
+
+def test_json_export_encodes_datetimes_as_iso_8601():
+    data = [{"id": 1, "when": datetime(2024, 1, 2, 3, 4, 5), "languages": "ja, en"}]
+    expected = [{**data[0], "when": "2024-01-02T03:04:05"}]
+
+    assert Exporter.to_json(data) == json.dumps(expected, indent=2).encode()
+    assert json.loads(Exporter.to_json(data, pretty=False)) == expected
+    assert json.loads(Exporter.to_json([{"path": Path("/media/a.mkv")}])) == [{"path": "/media/a.mkv"}]
+
+
+def test_shows_export_format_reads_attributes_with_defaults():
+    show = SimpleNamespace(
+        id=1, title="Show", is_anime=True, anime_source="folder",
+        season_count=2, episode_count=10, issues_count=3,
+    )
+    bare = SimpleNamespace(id=2, title="Bare")
+
+    rows = Exporter.shows_to_export_format([show, bare, {"id": 3}])
+
+    assert rows[0] == vars(show)
+    assert rows[1]["is_anime"] is False
+    assert rows[1]["issues_count"] == 0
+    assert rows[2] == {"id": 3}
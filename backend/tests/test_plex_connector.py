@@ -0,0 +1,158 @@
+"""Tests for Plex show matching against a fake Plex server."""
+
+from types import SimpleNamespace
+import unittest
+from xml.etree import ElementTree
+
+
+from app.core.plex_connector import PlexConnector
+
+
+def _episode(rating_key: int, season: int, number: int, file_path: str):
+    return SimpleNamespace(
+        ratingKey=rating_key,
+        title=f"Episode {number}",
+        seasonNumber=season,
+        episodeNumber=number,
+        media=[SimpleNamespace(parts=[SimpleNamespace(file=file_path)])],
+    )
+
+
+def _show(rating_key: int, title: str, genres: list[str], episodes: list, original_title=None):
+    return SimpleNamespace(
+        ratingKey=rating_key,
+        title=title,
+        originalTitle=original_title,
+        year=2013,
+        genres=[SimpleNamespace(tag=genre) for genre in genres],
+        thumbUrl=f"http://plex/thumb/{rating_key}",
+        episodes=lambda: episodes,
+    )
+
+
+def _episode_listing(shows: list) -> ElementTree.Element:
+    """Build the XML Plex returns for /library/sections/{key}/all?type=4."""
+    container = ElementTree.Element("MediaContainer")
+    for show in shows:
+        for episode in show.episodes():
+            video = ElementTree.SubElement(
+                container,
+                "Video",
+                ratingKey=str(episode.ratingKey),
+                grandparentRatingKey=str(show.ratingKey),
+                parentIndex=str(episode.seasonNumber),
+                index=str(episode.episodeNumber),
+            )
+            for media in episode.media:
+                media_element = ElementTree.SubElement(video, "Media")
+                for part in media.parts:
+                    ElementTree.SubElement(media_element, "Part", file=part.file)
+    return container
+
+
+def _fake_server(shows: list, bulk_listing: bool = True):
+    section = SimpleNamespace(type="show", title="TV", key=1, agent="tv", all=lambda: shows)
+    shows_by_key = {show.ratingKey: show for show in shows}
+
+    def query(key):
+        if not bulk_listing:
+            raise RuntimeError("bulk listing unavailable")
+        assert key == "/library/sections/1/all?type=4&includeMedia=1"
+        return _episode_listing(shows)
+
+    return SimpleNamespace(
+        library=SimpleNamespace(sections=lambda: [section]),
+        fetchItem=lambda key: shows_by_key[key],
+        query=query,
+    )
+
+
+class PlexConnectorMatchingTests(unittest.TestCase):
+    def setUp(self):
+        self.anime = _show(
+            101,
+            "Shingeki no Kyojin",
+            ["Anime", "Action"],
+            [
+                _episode(1001, 1, 1, "/data/anime/Attack on Titan/Season 01/S01E01.mkv"),
+                _episode(1002, 1, 2, "/data/anime/Attack on Titan/Season 01/S01E02.mkv"),
+            ],
+            original_title="Attack on Titan",
+        )
+        self.drama = _show(
+            202,
+            "The Wire (2002)",
+            ["Drama"],
+            [_episode(2001, 1, 1, "/data/tv/The Wire/Season 01/The.Wire.S01E01.mkv")],
+        )
+        self.connector = PlexConnector(token="token")
+        self.connector._server = _fake_server([self.anime, self.drama])
+
+    def test_find_show_matches_title_variants(self):
+        self.assertEqual(self.connector.find_show("Attack on Titan").title, "Shingeki no Kyojin")
+        self.assertEqual(self.connector.find_show("wire").title, "The Wire (2002)")
+
+    def test_find_show_matches_punctuation_stripped_subtitle_variant(self):
+        show = _show(303, "Steins;Gate: Movie", ["Anime"], [])
+        self.connector._server = _fake_server([show])
+
+        self.assertEqual(self.connector.find_show("SteinsGate").title, "Steins;Gate: Movie")
+
+    def test_find_show_fuzzy_matches_typos_and_rejects_unrelated_titles(self):
+        self.assertEqual(self.connector.find_show("Atack on Titan").title, "Shingeki no Kyojin")
+        self.assertIsNone(self.connector.find_show("Completely Different Program"))
+
+    def test_find_show_by_file_matches_when_container_paths_differ(self):
+        show = self.connector.find_show_by_file("/media/anime/Attack on Titan/Season 01/S01E02.mkv")
+
+        self.assertIsNotNone(show)
+        self.assertEqual(show.title, "Shingeki no Kyojin")
+
+    def test_get_tv_shows_falls_back_to_per_show_episodes(self):
+        self.connector._server = _fake_server([self.anime, self.drama], bulk_listing=False)
+
+        shows = self.connector.get_tv_shows()
+
+        self.assertEqual(
+            {show.title: len(show.file_paths) for show in shows},
+            {"Shingeki no Kyojin": 2, "The Wire (2002)": 1},
+        )
+
+    def test_sync_show_metadata_reports_anime_from_genres(self):
+        metadata = self.connector.sync_show_metadata(
+            "/media/anime/Attack on Titan/Season 02/S02E01.mkv",
+            title_from_path="Attack on Titan",
+        )
+
+        self.assertIsNotNone(metadata)
+        self.assertTrue(metadata["is_anime"])
+        self.assertEqual(metadata["title"], "Shingeki no Kyojin")
+        self.assertEqual(metadata["plex_rating_key"], "101")
+
+    def test_match_file_to_episode_uses_filename_fallback(self):
+        episode = self.connector.match_file_to_episode(
+            "/media/tv/The Wire/Season 01/The.Wire.S01E01.mkv"
+        )
+
+        self.assertIsNotNone(episode)
+        self.assertEqual(episode.season_number, 1)
+        self.assertEqual(episode.episode_number, 1)
+        self.assertEqual(episode.rating_key, 2001)
+
+
+    def test_get_show_episodes_fetches_each_show_once(self):
+        server = self.connector._server
+        fetched = []
+        fetch_item = server.fetchItem
+        server.fetchItem = lambda key: fetched.append(key) or fetch_item(key)
+
+        self.connector.match_file_to_episode("/data/anime/Attack on Titan/Season 01/S01E01.mkv")
+        episode = self.connector.match_file_to_episode(
+            "/data/anime/Attack on Titan/Season 01/S01E02.mkv"
+        )
+
+        self.assertEqual(episode.episode_number, 2)
+        self.assertEqual(fetched, [101])
+
+if __name__ == "__main__":
+    unittest.main()
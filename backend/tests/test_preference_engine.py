@@ -0,0 +1,117 @@
+"""Tests for audio preference evaluation."""
+
+import unittest
+
+from app.core.preference_engine import (
+    ISSUE_FLAG_MISSING_DUAL_AUDIO,
+    ISSUE_FLAG_MISSING_ENGLISH,
+    ISSUE_FLAG_MISSING_JAPANESE,
+    AudioPreferences,
+    PreferenceEngine,
+    issue_flags,
+)
+
+
+def _track(language, is_default=False, codec="AAC"):
+    return {"language": language, "is_default": is_default, "codec": codec}
+
+
+class PreferenceEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = PreferenceEngine()
+
+    def test_evaluate_flags_non_english_default_when_english_exists(self):
+        issues = self.engine.evaluate([_track("JA", is_default=True), _track("en")])
+
+        self.assertEqual(issues, ["Default audio track is 'ja', expected English"])
+
+    def test_evaluate_reports_missing_anime_languages(self):
+        issues = self.engine.evaluate([_track("ja", is_default=True)], is_anime=True)
+
+        self.assertEqual(issues, ["Missing English audio for dual audio (anime)"])
+
+    def test_issue_flags_classify_evaluated_messages(self):
+        anime_issues = self.engine.evaluate([_track("fr", is_default=True)], is_anime=True)
+
+        self.assertEqual(
+            issue_flags(anime_issues),
+            ISSUE_FLAG_MISSING_ENGLISH | ISSUE_FLAG_MISSING_JAPANESE | ISSUE_FLAG_MISSING_DUAL_AUDIO,
+        )
+        self.assertEqual(issue_flags(self.engine.evaluate([_track("ja")])), ISSUE_FLAG_MISSING_ENGLISH)
+        self.assertEqual(issue_flags(self.engine.evaluate([])), 0)
+
+    def test_evaluate_checks_preferred_codecs_case_insensitively(self):
+        engine = PreferenceEngine(AudioPreferences(preferred_codecs=["dts"]))
+
+        self.assertEqual(engine.evaluate([_track("en", codec="DTS")]), [])
+        self.assertEqual(
+            engine.evaluate([_track("en", codec="AAC")]),
+            ["No preferred audio codec found (has: aac)"],
+        )
+
+    def test_evaluate_detailed_returns_issue_codes(self):
+        issues = self.engine.evaluate_detailed([_track("fr", is_default=True)])
+
+        self.assertEqual([issue.code for issue in issues], ["MISSING_ENGLISH"])
+        self.assertEqual(self.engine.evaluate_detailed([])[0].code, "NO_AUDIO")
+
+    def test_evaluate_detailed_matches_evaluate_messages(self):
+        tracks = [_track("fr", is_default=True)]
+
+        issues = self.engine.evaluate_detailed(tracks, is_anime=True)
+
+        self.assertEqual(
+            [issue.code for issue in issues],
+            ["MISSING_JAPANESE", "MISSING_DUAL_AUDIO", "MISSING_DUAL_AUDIO", "WRONG_DEFAULT_ANIME"],
+        )
+        self.assertEqual(
+            [issue.message for issue in issues], self.engine.evaluate(tracks, is_anime=True)
+        )
+
+    def test_evaluate_detailed_reuses_results_until_preferences_change(self):
+        tracks = [_track("fr", is_default=True)]
+
+        first = self.engine.evaluate_detailed(tracks)
+        second = self.engine.evaluate_detailed([_track("fr", is_default=True)])
+        self.assertEqual(first, second)
+        self.assertIs(first[0], second[0])
+
+        self.engine.preferences = AudioPreferences(require_english_non_anime=False)
+        self.assertEqual(self.engine.evaluate_detailed(tracks), [])
+
+    def test_get_summary_keeps_languages_in_track_order(self):
+        summary = self.engine.get_summary(
+            [_track("ja"), _track("EN", is_default=True), _track("ja"), _track(None)],
+            is_anime=True,
+        )
+
+        self.assertEqual(summary["languages"], ["ja", "EN"])
+        self.assertEqual(summary["default_language"], "EN")
+        self.assertFalse(summary["has_issues"])
+
+    def test_first_default_flagged_track_wins(self):
+        tracks = [_track("en", is_default=True), _track("de", is_default=True)]
+
+        self.assertEqual(self.engine.evaluate(tracks), [])
+        self.assertEqual(self.engine.get_summary(tracks)["default_language"], "en")
+
+    def test_evaluate_leaves_tracks_untouched_and_sees_later_edits(self):
+        track = _track("fr", is_default=True)
+        before = dict(track)
+
+        self.assertTrue(self.engine.evaluate([track]))
+        self.assertEqual(track, before)
+
+        track["language"] = "en"
+        self.assertEqual(self.engine.evaluate([track]), [])
+
+    def test_get_summary_for_no_tracks(self):
+        summary = self.engine.get_summary([])
+
+        self.assertEqual(summary["error_count"], 1)
+        self.assertEqual(summary["languages"], [])
+        self.assertIsNone(summary["default_language"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,7 +16,7 @@ class ScanStateManagerTests(unittest.IsolatedAsyncioTestCase):
         self.assertTrue(started.is_running)
         self.assertEqual(started.files_scanned, 0)
         self.assertEqual(started.files_total, 0)
-        self.assertFalse(await self.manager.is_cancel_requested(user_id=1))
+        self.assertFalse(self.manager.is_cancel_requested(user_id=1))
 
     async def test_duplicate_start_is_rejected(self) -> None:
         first = await self.manager.start_scan(user_id=1)
@@ -32,7 +32,7 @@ class ScanStateManagerTests(unittest.IsolatedAsyncioTestCase):
 
         self.assertIsNotNone(status)
         self.assertTrue(status.is_running)
-        self.assertTrue(await self.manager.is_cancel_requested(user_id=1))
+        self.assertTrue(self.manager.is_cancel_requested(user_id=1))
 
     async def test_status_updates_and_finish_scan(self) -> None:
         await self.manager.start_scan(user_id=1)
@@ -49,7 +49,26 @@ class ScanStateManagerTests(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(finished.is_running)
         self.assertIsNone(finished.current_location)
         self.assertIsNone(finished.current_file)
-        self.assertFalse(await self.manager.is_cancel_requested(user_id=1))
+        self.assertFalse(self.manager.is_cancel_requested(user_id=1))
+
+    async def test_snapshots_are_not_changed_by_later_transitions(self) -> None:
+        started = await self.manager.start_scan(user_id=1)
+        await self.manager.append_error(user_id=1, error="bad file")
+        first_error = await self.manager.get_status(user_id=1)
+        await self.manager.update_status(user_id=1, files_scanned=2)
+        await self.manager.append_error(user_id=1, error="another file")
+
+        status = await self.manager.get_status(user_id=1)
+        self.assertEqual(started.errors, [])
+        self.assertEqual(started.files_scanned, 0)
+        self.assertEqual(first_error.errors, ["bad file"])
+        self.assertEqual(status.errors, ["bad file", "another file"])
+        self.assertEqual(status.files_scanned, 2)
+        self.assertNotIn("errors_len", status.model_dump())
+
+    async def test_update_status_rejects_unknown_fields(self) -> None:
+        with self.assertRaises(TypeError):
+            await self.manager.update_status(user_id=1, files_scaned=1)
 
     async def test_user_states_are_isolated(self) -> None:
         await self.manager.start_scan(user_id=1)
@@ -58,8 +77,8 @@ class ScanStateManagerTests(unittest.IsolatedAsyncioTestCase):
         self.assertFalse(user_two_status.is_running)
 
         await self.manager.cancel_scan(user_id=1)
-        self.assertTrue(await self.manager.is_cancel_requested(user_id=1))
-        self.assertFalse(await self.manager.is_cancel_requested(user_id=2))
+        self.assertTrue(self.manager.is_cancel_requested(user_id=1))
+        self.assertFalse(self.manager.is_cancel_requested(user_id=2))
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 from types import SimpleNamespace
+from unittest.mock import patch
 
+import pytest
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
@@ -7,6 +9,7 @@ from app.api.auth import get_current_user
 from app.api.scan import _invalid_scan_input, _validate_scan_media_type
 from app.main import app
 from app.models.database import get_db
+from app.models.schemas import validate_media_root_path
 
 
 class DummySession:
@@ -82,3 +85,29 @@ def test_invalid_scan_input_helper_returns_consistent_payload():
         "detail": "Invalid request input.",
         "errors": ["Path must be under /media."],
     }
+
+
+def test_media_root_validator_rejects_outside_paths_without_resolving():
+    with patch("app.models.schemas.Path.resolve") as resolve:
+        for path in ("/tmp/library", "/media2/library", "/media/../etc"):
+            with pytest.raises(ValueError, match="Path must be under /media."):
+                validate_media_root_path(path)
+
+    resolve.assert_not_called()
+
+
+def test_browse_lists_visible_subdirectories_sorted(tmp_path):
+    for name in ("b-show", "a-show", ".hidden"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "file.mkv").write_bytes(b"")
+
+    with patch("app.api.scan.validate_media_root_path", side_effect=lambda path: path):
+        response = client.get("/api/scan/browse", params={"path": str(tmp_path)})
+        missing = client.get("/api/scan/browse", params={"path": str(tmp_path / "x")})
+
+    assert response.status_code == 200
+    assert response.json()["directories"] == [
+        {"name": "a-show", "path": str(tmp_path / "a-show")},
+        {"name": "b-show", "path": str(tmp_path / "b-show")},
+    ]
+    assert missing.status_code == 404
@@ -52,6 +52,17 @@ class MediaScannerAutoFixTests(unittest.TestCase):
         self.assertEqual(result, audio_info)
         set_default_mock.assert_not_called()
 
+    def test_auto_fix_follows_reassigned_preferences(self):
+        scanner = MediaScanner(
+            audio_preferences=AudioPreferences(auto_fix_english_default_non_anime=False)
+        )
+
+        scanner.preference_engine.preferences = AudioPreferences(
+            auto_fix_english_default_non_anime=True
+        )
+
+        self.assertTrue(scanner.preference_engine.auto_fix_enabled)
+
     def test_auto_fix_skips_anime(self):
         audio_info = {
             "audio_tracks": [
@@ -92,6 +103,44 @@ class MediaScannerAutoFixTests(unittest.TestCase):
         self.assertEqual(result, refreshed_info)
         fix_mock.assert_called_once_with("/media/movies/file.mkv", audio_info["audio_tracks"], 1)
 
+    def test_auto_fix_uses_indexes_recorded_by_the_analyzer(self):
+        audio_info = {
+            "audio_tracks": [
+                {"index": 0, "language": "ja", "is_default": True},
+                {"index": 1, "language": "en", "is_default": False},
+                {"index": 2, "language": "en", "is_default": False},
+            ],
+            "english_track_index": 1,
+            "default_track_index": 0,
+        }
+        self.scanner.analyzer.analyze = MagicMock(return_value=audio_info)
+
+        with patch.object(self.scanner, "_get_english_default_fix_index") as scan_mock, patch(
+            "app.core.scanner.set_default_track_by_index", return_value=True
+        ) as fix_mock:
+            self.scanner._auto_fix_default_track("/media/movies/file.mkv", audio_info, is_anime=False)
+
+        scan_mock.assert_not_called()
+        fix_mock.assert_called_once_with("/media/movies/file.mkv", audio_info["audio_tracks"], 1)
+
+    def test_auto_fix_skips_when_recorded_default_is_english(self):
+        audio_info = {
+            "audio_tracks": [
+                {"index": 0, "language": "en", "is_default": False},
+                {"index": 1, "language": "en", "is_default": True},
+            ],
+            "english_track_index": 0,
+            "default_track_index": 1,
+        }
+
+        with patch("app.core.scanner.set_default_track_by_index") as fix_mock:
+            result = self.scanner._auto_fix_default_track(
+                "/media/movies/file.mkv", audio_info, is_anime=False
+            )
+
+        self.assertEqual(result, audio_info)
+        fix_mock.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
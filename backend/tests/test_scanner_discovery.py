@@ -0,0 +1,51 @@
+"""Tests for media file discovery."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.core.scanner import MediaScanner
+
+
+class DiscoverFilesTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.scanner = MediaScanner()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _touch(self, relative: str) -> str:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"")
+        return str(path)
+
+    def test_finds_media_files_recursively_in_sorted_order(self):
+        episode = self._touch("Show/Season 01/Show.S01E01.MKV")
+        movie = self._touch("Movie (2020)/Movie.mp4")
+        self._touch("Show/Season 01/Show.S01E01.srt")
+        self._touch("Show/notes")
+
+        files = self.scanner.discover_files(str(self.root))
+
+        self.assertEqual(files, sorted([episode, movie]))
+
+    def test_captures_file_stats_for_process_file(self):
+        episode = self._touch("Show/Show.S01E01.mkv")
+
+        self.scanner.discover_files(str(self.root))
+
+        self.assertEqual(
+            self.scanner._discovered_stats[episode].st_mtime, os.stat(episode).st_mtime
+        )
+
+    def test_missing_location_raises(self):
+        with self.assertRaises(ValueError):
+            self.scanner.discover_files(str(self.root / "missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
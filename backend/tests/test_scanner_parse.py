@@ -0,0 +1,48 @@
+"""Tests for show/season/episode parsing from file paths."""
+
+import unittest
+
+from app.core.scanner import _parse_dir_info, clear_parse_caches, parse_show_info
+
+
+class ParseShowInfoTests(unittest.TestCase):
+    def test_first_matching_pattern_wins(self):
+        self.assertEqual(
+            parse_show_info("/media/tv/The.Show/Season 02/E05 - Title.mkv", "/media/tv"),
+            {"show": "The Show", "season": 2, "episode": 5},
+        )
+        self.assertEqual(
+            parse_show_info("/media/tv/Show/S01E02.mkv", "/media/tv"),
+            {"show": "Show", "season": 1, "episode": 2},
+        )
+        self.assertEqual(
+            parse_show_info("/media/tv/Show - S03E04 - Title.mkv", "/media/tv"),
+            {"show": "Show", "season": 3, "episode": 4},
+        )
+
+    def test_unmatched_path_falls_back_to_folders(self):
+        self.assertEqual(
+            parse_show_info("/media/tv/Show/Extras/behind.mkv", "/media/tv"),
+            {"show": "Show", "season": 1, "episode": None},
+        )
+
+    def test_season_directory_is_parsed_once(self):
+        clear_parse_caches()
+
+        for episode in range(1, 4):
+            info = parse_show_info(f"/media/tv/Show/Season 01/E0{episode}.mkv", "/media/tv")
+            self.assertEqual(info, {"show": "Show", "season": 1, "episode": episode})
+
+        cache = _parse_dir_info.cache_info()
+        self.assertEqual((cache.misses, cache.hits), (1, 2))
+
+    def test_titles_from_different_folders_are_interned(self):
+        first = parse_show_info("/media/tv/Some.Show/S01E01.mkv", "/media/tv")
+        second = parse_show_info("/media/tv2/Some.Show/S01E02.mkv", "/media/tv2")
+
+        self.assertEqual(first["show"], "Some Show")
+        self.assertIs(first["show"], second["show"])
+
+
+if __name__ == "__main__":
+    unittest.main()
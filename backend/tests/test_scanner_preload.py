@@ -0,0 +1,217 @@
+"""Tests for the scanner's bulk preload of existing rows."""
+
+import os
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.scanner import MediaScanner
+from app.models.entities import AudioTrack, MediaFile, Season, Show, User
+
+
+@pytest.mark.anyio
+async def test_preloaded_rows_are_reused_for_each_file(db_session, tmp_path):
+    show_dir = tmp_path / "Show" / "Season 01"
+    show_dir.mkdir(parents=True)
+    unchanged = show_dir / "Show.S01E01.mkv"
+    new_episode = show_dir / "Show.S01E02.mkv"
+    unchanged.write_bytes(b"")
+    new_episode.write_bytes(b"")
+
+    user = User(plex_user_id="1", plex_username="user", plex_token="token")
+    db_session.add(user)
+    await db_session.flush()
+    show = Show(user_id=user.id, title="Show", media_type="tv")
+    db_session.add(show)
+    await db_session.flush()
+    season = Season(show_id=show.id, season_number=1)
+    existing = MediaFile(
+        user_id=user.id,
+        file_path=str(unchanged),
+        filename=unchanged.name,
+        file_size=0,
+        last_modified=datetime.fromtimestamp(os.stat(unchanged).st_mtime) + timedelta(days=1),
+    )
+    db_session.add_all([season, existing])
+    await db_session.commit()
+
+    scanner = MediaScanner()
+    await scanner.preload(db_session, user.id, [str(unchanged), str(new_episode)])
+
+    with (
+        patch.object(scanner.analyzer, "analyze", return_value={"audio_tracks": []}),
+        patch.object(db_session, "execute", wraps=db_session.execute) as execute,
+    ):
+        skipped = await scanner.process_file(
+            str(unchanged), str(tmp_path), "tv", user.id, db_session
+        )
+        added = await scanner.process_file(
+            str(new_episode), str(tmp_path), "tv", user.id, db_session
+        )
+
+    assert skipped is None
+    assert added.show_id == show.id
+    assert added.season_id == season.id
+    # Neither file needed a per-file SELECT
+    execute.assert_not_called()
+    assert await db_session.scalar(select(func.count(Show.id))) == 1
+    assert await db_session.scalar(select(func.count(Season.id))) == 1
+
+
+@pytest.mark.anyio
+async def test_manifest_skips_unchanged_files_and_reloads_changed(db_session, tmp_path):
+    unchanged = tmp_path / "Movie A.mkv"
+    changed = tmp_path / "Movie B.mkv"
+    unchanged.write_bytes(b"a")
+    changed.write_bytes(b"b")
+
+    user = User(plex_user_id="1", plex_username="user", plex_token="token")
+    db_session.add(user)
+    await db_session.flush()
+    rows = {}
+    for path in (unchanged, changed):
+        stat = os.stat(path)
+        rows[path] = MediaFile(
+            user_id=user.id,
+            file_path=str(path),
+            filename=path.name,
+            file_size=stat.st_size,
+            last_modified=datetime.fromtimestamp(stat.st_mtime),
+            file_mtime_ns=stat.st_mtime_ns,
+        )
+    db_session.add_all(rows.values())
+    await db_session.commit()
+    changed.write_bytes(b"changed")
+
+    scanner = MediaScanner()
+    scanner.discover_files(str(tmp_path))
+    await scanner.preload(db_session, user.id, [str(unchanged), str(changed)])
+
+    assert set(scanner._preload.media_files) == {str(changed)}
+
+    audio_info = {
+        "audio_tracks": [
+            {"index": 0, "language": "ja", "is_default": True},
+            {"index": 1, "language": "en"},
+        ]
+    }
+    with patch.object(scanner.analyzer, "analyze", return_value=audio_info):
+        assert scanner.prefetch_analysis(str(unchanged), user.id) is None
+        assert scanner.prefetch_analysis(str(changed), user.id) == audio_info
+
+        skipped = await scanner.process_file(
+            str(unchanged), str(tmp_path), "movie", user.id, db_session
+        )
+        updated = await scanner.process_file(
+            str(changed), str(tmp_path), "movie", user.id, db_session
+        )
+
+    assert skipped is None
+    assert updated is rows[changed]
+    assert updated.file_size == len(b"changed")
+    assert updated.file_mtime_ns == os.stat(changed).st_mtime_ns
+    tracks = (
+        await db_session.execute(
+            select(AudioTrack.track_index, AudioTrack.language, AudioTrack.is_default)
+            .where(AudioTrack.media_file_id == updated.id)
+            .order_by(AudioTrack.track_index)
+        )
+    ).all()
+    assert tracks == [(0, "ja", True), (1, "en", False)]
+
+
+@pytest.mark.anyio
+async def test_preloaded_rows_are_not_shared_across_sessions(db_session):
+    user = User(plex_user_id="1", plex_username="user", plex_token="token")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add(Show(user_id=user.id, title="Show", media_type="tv"))
+    await db_session.commit()
+
+    scanner = MediaScanner()
+    await scanner.preload(db_session, user.id, [])
+
+    async with AsyncSession(db_session.bind, expire_on_commit=False) as other:
+        show = await scanner._get_show_by_title(other, user.id, "Show")
+
+        assert show is not None
+        assert show in other
+        assert show not in db_session
+
+
+@pytest.mark.anyio
+async def test_unchanged_file_is_skipped_without_loading_its_row(db_session, tmp_path):
+    path = tmp_path / "Movie.mkv"
+    path.write_bytes(b"a")
+    stat = os.stat(path)
+
+    user = User(plex_user_id="1", plex_username="user", plex_token="token")
+    db_session.add(user)
+    await db_session.flush()
+    db_session.add(
+        MediaFile(
+            user_id=user.id,
+            file_path=str(path),
+            filename=path.name,
+            file_size=stat.st_size,
+            last_modified=datetime.fromtimestamp(stat.st_mtime),
+            file_mtime_ns=stat.st_mtime_ns,
+        )
+    )
+    await db_session.commit()
+    db_session.expunge_all()
+
+    scanner = MediaScanner()
+    unchanged, existing = await scanner._get_existing_file(db_session, user.id, str(path), stat)
+    assert (unchanged, existing) == (True, None)
+    assert not any(isinstance(obj, MediaFile) for obj in db_session.identity_map.values())
+
+    path.write_bytes(b"changed")
+    unchanged, existing = await scanner._get_existing_file(
+        db_session, user.id, str(path), os.stat(path)
+    )
+    assert not unchanged
+    assert existing.file_path == str(path)
+
+
+@pytest.mark.anyio
+async def test_new_rows_share_the_batch_timestamp(db_session, tmp_path):
+    path = tmp_path / "Show" / "Season 01" / "Show.S01E01.mkv"
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"")
+
+    user = User(plex_user_id="1", plex_username="user", plex_token="token")
+    db_session.add(user)
+    await db_session.commit()
+
+    now = datetime(2026, 1, 2, 3, 4, 5)
+    scanner = MediaScanner()
+    with patch.object(scanner.analyzer, "analyze", return_value={"audio_tracks": []}):
+        added = await scanner.process_file(
+            str(path), str(tmp_path), "tv", user.id, db_session, now=now
+        )
+
+    assert added.last_scanned == now
+    assert added.show.created_at == added.show.updated_at == now
+
+
+@pytest.mark.anyio
+async def test_issue_columns_are_written_with_the_insert(db_session, tmp_path):
+    path = tmp_path / "Movie.mkv"
+    path.write_bytes(b"")
+
+    user = User(plex_user_id="1", plex_username="user", plex_token="token")
+    db_session.add(user)
+    await db_session.commit()
+
+    scanner = MediaScanner()
+    with patch.object(scanner.analyzer, "analyze", return_value={"audio_tracks": []}):
+        added = await scanner.process_file(str(path), str(tmp_path), "movie", user.id, db_session)
+
+    assert added.has_issues
+    assert added.issue_details
+    # Nothing is left for a follow-up UPDATE at the next flush
+    assert added not in db_session.dirty
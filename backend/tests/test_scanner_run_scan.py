@@ -1,77 +1,87 @@
 """Tests for scanner run loop argument passing and happy-path status."""
 
-import unittest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.scan_state import scan_state_manager
 from app.core.scanner import run_scan
 
 
-class _FakeResult:
-    def scalar_one_or_none(self):
-        return None
-
-
-class _FakeSession:
-    async def execute(self, *args, **kwargs):
-        return _FakeResult()
-
-    async def scalar(self, *args, **kwargs):
-        return 0
-
-    async def commit(self):
-        return None
-
-
-class _FakeSessionContext:
-    async def __aenter__(self):
-        return _FakeSession()
-
-    async def __aexit__(self, exc_type, exc, tb):
-        return False
-
-
-class RunScanArgumentPassingTests(unittest.IsolatedAsyncioTestCase):
-    async def asyncSetUp(self) -> None:
-        await scan_state_manager.reset()
-
-    async def asyncTearDown(self) -> None:
-        await scan_state_manager.reset()
-
-    async def test_run_scan_single_file_calls_process_file_with_user_id_and_no_errors(
-        self,
+@pytest.fixture
+def scan_session():
+    """An AsyncSession mock whose queries all come back empty."""
+    session = AsyncMock(spec=AsyncSession)
+    # MagicMock results iterate as empty, as do their scalars()
+    session.execute.return_value = MagicMock(scalar_one_or_none=MagicMock(return_value=None))
+    session.scalar.return_value = 0
+    return session
+
+
+@pytest.fixture
+def scan_session_maker(scan_session):
+    """Patch the scanner's session factory to hand out scan_session."""
+    context = MagicMock()
+    context.__aenter__.return_value = scan_session
+    with patch("app.core.scanner.scan_session_maker", return_value=context) as maker:
+        yield maker
+
+
+@pytest.mark.anyio
+async def test_run_scan_single_file_calls_process_file_with_user_id_and_no_errors(
+    scan_session, scan_session_maker
+):
+    file_path = "/media/tv/Show/Season 01/E01.mkv"
+
+    with (
+        patch(
+            "app.core.scanner.MediaScanner.discover_files", return_value=[file_path]
+        ),
+        patch(
+            "app.core.scanner.MediaScanner.process_file", new_callable=AsyncMock
+        ) as process_file,
     ):
-        file_path = "/media/tv/Show/Season 01/E01.mkv"
-
-        with (
-            patch(
-                "app.core.scanner.MediaScanner.discover_files", return_value=[file_path]
-            ),
-            patch(
-                "app.core.scanner.MediaScanner.process_file", new_callable=AsyncMock
-            ) as process_file,
-            patch(
-                "app.core.scanner.async_session_maker",
-                return_value=_FakeSessionContext(),
-            ),
-        ):
-            await run_scan(
-                locations=["/media/tv"],
-                location_media_types={"/media/tv": "tv"},
-                user_id=42,
-                incremental=False,
-            )
-
-        process_file.assert_awaited_once()
-        process_file.assert_awaited_once_with(
-            file_path, "/media/tv", "tv", 42, unittest.mock.ANY
+        await run_scan(
+            locations=["/media/tv"],
+            location_media_types={"/media/tv": "tv"},
+            user_id=42,
+            incremental=False,
         )
 
-        status = await scan_state_manager.get_status(42)
-        self.assertEqual(status.files_total, 1)
-        self.assertEqual(status.files_scanned, 1)
-        self.assertEqual(status.errors, [])
+    process_file.assert_awaited_once()
+    process_file.assert_awaited_once_with(
+        file_path,
+        "/media/tv",
+        "tv",
+        42,
+        scan_session,
+        audio_info=None,
+        now=ANY,
+    )
+
+    status = await scan_state_manager.get_status(42)
+    assert status.files_total == 1
+    assert status.files_scanned == 1
+    assert status.errors == []
+    scan_session.commit.assert_awaited()
+
+
+@pytest.mark.anyio
+async def test_run_scan_loads_plex_library_once_before_processing(scan_session_maker):
+    with (
+        patch("app.core.scanner.MediaScanner.discover_files", return_value=[]),
+        patch("app.core.scanner.PlexConnector") as plex_connector_cls,
+    ):
+        plex_connector_cls.return_value.get_tv_shows.side_effect = RuntimeError("down")
 
+        await run_scan(
+            locations=["/media/tv"],
+            location_media_types={"/media/tv": "tv"},
+            user_id=42,
+            user_plex_token="token",
+        )
 
-if __name__ == "__main__":
-    unittest.main()
+    plex_connector_cls.return_value.get_tv_shows.assert_called_once_with()
+    status = await scan_state_manager.get_status(42)
+    assert not status.is_running
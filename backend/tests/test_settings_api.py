@@ -0,0 +1,51 @@
+import pytest
+
+from app.api.auth import get_current_user
+from app.models.entities import User
+
+
+@pytest.fixture
+async def settings_app(db_session_maker, api_app, override_get_db):
+    async with db_session_maker() as session:
+        user = User(plex_user_id="1", plex_username="user", plex_token="token")
+        session.add(user)
+        await session.commit()
+
+    async def override_current_user():
+        return user
+
+    api_app.dependency_overrides[get_current_user] = override_current_user
+
+    return api_app
+
+
+@pytest.mark.anyio
+async def test_get_settings_returns_defaults_when_nothing_saved(settings_app, client):
+    resp = await client.get("/api/settings")
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["audio_preferences"]["require_english_non_anime"] is True
+    assert body["anime_detection"]["use_plex_genres"] is True
+    assert body["file_extensions"] == [".mkv", ".mp4", ".avi", ".m4v"]
+
+
+@pytest.mark.anyio
+async def test_update_settings_round_trips_partial_updates(settings_app, client):
+    put_resp = await client.put(
+        "/api/settings",
+        json={"audio_preferences": {"require_english_non_anime": False}},
+    )
+    assert put_resp.status_code == 200
+    assert put_resp.json()["audio_preferences"]["require_english_non_anime"] is False
+
+    put_resp = await client.put(
+        "/api/settings",
+        json={"file_extensions": [".mkv"]},
+    )
+    assert put_resp.status_code == 200
+    assert put_resp.json()["audio_preferences"]["require_english_non_anime"] is False
+    assert put_resp.json()["file_extensions"] == [".mkv"]
+
+    get_resp = await client.get("/api/settings")
+    assert get_resp.json() == put_resp.json()
@@ -1,55 +1,75 @@
 import pytest
 from fastapi import BackgroundTasks
 from sqlalchemy import text, select
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from app.api.scan import start_scan
-from app.core.encryption import decrypt_value, encrypt_value, is_encrypted
-from app.core.scan_state import scan_state_manager
-from app.models.entities import Base, ScanLocation, User
+from app.core.encryption import _cipher, _cipher_for_key, decrypt_value, encrypt_value, is_encrypted
+from app.models.entities import ScanLocation, User
 from app.models.migrations import apply_token_encryption_migration
 from app.models.schemas import ScanStartRequest
 
 
+def test_cipher_is_reused_per_key():
+    assert _cipher() is _cipher()
+    assert _cipher_for_key("other-key") is not _cipher()
+    assert decrypt_value(encrypt_value("round-trip")) == "round-trip"
+
+
 @pytest.mark.anyio
-async def test_token_backfill_encrypts_legacy_plaintext_rows():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+async def test_token_backfill_encrypts_legacy_plaintext_rows(db_connection):
+    conn = db_connection
+    await conn.execute(
+        text(
+            """
+            INSERT INTO users (plex_user_id, plex_username, plex_email, plex_token, plex_thumb_url, created_at, last_login)
+            VALUES
+                ('legacy', 'legacy-user', NULL, 'plaintext-token', NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP),
+                ('already', 'encrypted-user', NULL, :encrypted_token, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            """
+        ),
+        {"encrypted_token": encrypt_value("already-secret")},
+    )
+
+    await apply_token_encryption_migration(conn)
+
+    rows = (await conn.execute(text("SELECT plex_user_id, plex_token FROM users"))).fetchall()
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    row_map = {row[0]: row[1] for row in rows}
+    assert is_encrypted(row_map["legacy"])
+    assert decrypt_value(row_map["legacy"]) == "plaintext-token"
+    assert decrypt_value(row_map["already"]) == "already-secret"
+
+
+@pytest.mark.anyio
+async def test_token_backfill_updates_every_batch(monkeypatch, db_connection):
+    monkeypatch.setattr("app.models.migrations.TOKEN_MIGRATION_BATCH_SIZE", 2)
+    conn = db_connection
+    for index in range(5):
         await conn.execute(
             text(
                 """
-                INSERT INTO users (plex_user_id, plex_username, plex_email, plex_token, plex_thumb_url, created_at, last_login)
-                VALUES
-                    ('legacy', 'legacy-user', NULL, 'plaintext-token', NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP),
-                    ('already', 'encrypted-user', NULL, :encrypted_token, NULL, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+                INSERT INTO users (plex_user_id, plex_username, plex_token, created_at, last_login)
+                VALUES (:user_id, :user_id, :token, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
                 """
             ),
-            {"encrypted_token": encrypt_value("already-secret")},
+            {"user_id": f"user-{index}", "token": f"token-{index}"},
         )
 
-        await apply_token_encryption_migration(conn)
+    await apply_token_encryption_migration(conn)
 
-        rows = (await conn.execute(text("SELECT plex_user_id, plex_token FROM users"))).fetchall()
+    rows = (await conn.execute(text("SELECT plex_user_id, plex_token FROM users"))).fetchall()
 
-    row_map = {row[0]: row[1] for row in rows}
-    assert is_encrypted(row_map["legacy"])
-    assert decrypt_value(row_map["legacy"]) == "plaintext-token"
-    assert decrypt_value(row_map["already"]) == "already-secret"
-
-    await engine.dispose()
+    assert {row[0]: decrypt_value(row[1]) for row in rows} == {
+        f"user-{index}": f"token-{index}" for index in range(5)
+    }
+    assert all(is_encrypted(row[1]) for row in rows)
 
 
 @pytest.mark.anyio
-async def test_scan_runtime_receives_decrypted_token_when_db_value_is_encrypted():
-    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
-    session_maker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
-
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-    async with session_maker() as session:
+async def test_scan_runtime_receives_decrypted_token_when_db_value_is_encrypted(
+    db_session_maker,
+):
+    async with db_session_maker() as session:
         user = User(
             plex_user_id="1",
             plex_username="scanner-user",
@@ -69,8 +89,7 @@ async def test_scan_runtime_receives_decrypted_token_when_db_value_is_encrypted(
         )
         await session.commit()
 
-    await scan_state_manager.reset()
-    async with session_maker() as session:
+    async with db_session_maker() as session:
         user = (await session.execute(select(User).where(User.plex_user_id == "1"))).scalar_one()
         bg = BackgroundTasks()
 
@@ -84,6 +103,3 @@ async def test_scan_runtime_receives_decrypted_token_when_db_value_is_encrypted(
         assert response.is_running is True
         assert len(bg.tasks) == 1
         assert bg.tasks[0].kwargs["user_plex_token"] == "runtime-plaintext-token"
-
-    await scan_state_manager.reset()
-    await engine.dispose()